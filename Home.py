@@ -12,4 +12,6 @@ Abre los modelos desde el menú de la izquierda:
 - Costo medio de largo plazo
 - v1 y v2 (rendimientos, costos, ganancias)
 - Varian (capítulos 16–19)
+- Estimación Cobb-Douglas con datos (CSV)
+- Acumulación de capital (simulación con choques)
 """)
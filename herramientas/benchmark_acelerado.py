@@ -0,0 +1,87 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modelos import acelerado, cobb, rendimientos  # noqa: E402
+
+# Compara los kernels de modelos/acelerado.py contra las versiones de NumPy:
+# primero verifica que den el mismo resultado y luego mide tiempos.
+#
+#   python -m herramientas.benchmark_acelerado --tamanos 100000 1000000 10000000
+#
+# Termina con código 1 si algún resultado no coincide.
+
+RTOL = 1e-12
+
+
+def _mejor(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - t0)
+    return min(tiempos)
+
+
+def _iguales(x, y):
+    if isinstance(x, (tuple, list)):
+        return len(x) == len(y) and all(_iguales(a, b) for a, b in zip(x, y))
+    return np.allclose(x, y, rtol=RTOL, atol=0, equal_nan=True)
+
+
+def casos(n, rng):
+    L = np.linspace(1, 500, n)
+    K = rng.uniform(1, 50, n)
+    # CM cruza el precio varias veces para que haya raíces que comparar
+    CM = 50 + 10 * np.sin(L / 7)
+    return {
+        "produccion_cobb": (
+            lambda: cobb.produccion_cobb(10.0, K, L, 0.4, 0.7),
+            lambda: acelerado.produccion_cobb(10.0, K, L, 0.4, 0.7),
+        ),
+        "find_break_even": (
+            lambda: rendimientos.find_break_even(L, CM, 52.5),
+            lambda: acelerado.find_break_even(L, CM, 52.5),
+        ),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Equivalencia y tiempos de los kernels acelerados.")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if not acelerado.ACTIVO:
+        print("Numba no está disponible (o ACELERADO=0): se compara NumPy contra sí mismo.")
+    else:
+        print(f"Numba con {acelerado.HILOS} hilos.")
+    # Para medir el kernel compilado en todos los tamaños
+    acelerado.UMBRAL = 0
+    acelerado.MIN_HILOS_POTENCIA = 1
+
+    rng = np.random.default_rng(args.semilla)
+    fallas = 0
+    print(f"{'kernel':30s} {'n':>11s} {'NumPy':>10s} {'acelerado':>10s} {'x':>6s}  igual")
+    for n in args.tamanos:
+        for nombre, (ref, acel) in casos(n, rng).items():
+            igual = _iguales(ref(), acel())  # también compila la primera vez
+            fallas += not igual
+            t_ref = _mejor(ref, args.repeticiones)
+            t_acel = _mejor(acel, args.repeticiones)
+            print(f"{nombre:30s} {n:11,d} {t_ref * 1000:8.1f}ms {t_acel * 1000:8.1f}ms "
+                  f"{t_ref / t_acel:6.1f}  {'sí' if igual else 'NO'}", flush=True)
+
+    if fallas:
+        print(f"{fallas} comparaciones no coinciden (rtol={RTOL})")
+    return 1 if fallas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
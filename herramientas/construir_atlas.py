@@ -0,0 +1,136 @@
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from modelos import atlas  # noqa: E402
+
+# Construye el atlas de modelos/atlas.py. Cada página se ejecuta sin navegador
+# (AppTest) en cada punto de una retícula alrededor de sus valores iniciales y
+# se graba lo que sirven resultado() y memo(); así el atlas contiene
+# exactamente lo que la página habría calculado, con las mismas claves.
+#
+#   python -m herramientas.construir_atlas --radio 2 --limpiar
+#   python -m herramientas.construir_atlas --config reticula.json
+#
+# La retícula de un eje son los valores inicial ± 1..radio pasos del widget
+# (sin salirse de su mínimo y máximo). Por omisión es una estrella: se mueve un
+# eje a la vez, que es lo que hace un clic. El archivo --config permite, por
+# página, elegir los ejes (por etiqueta), el radio y el modo "producto" (todas
+# las combinaciones):
+#
+#   {"pages/4_Largo_Plazo.py": {"radio": 1, "modo": "producto",
+#                               "ejes": ["a₁ (nivel)", "a₂ (nivel)", "a₃ (nivel)"]}}
+
+# Las páginas cuyos resultados pasan por resultado() o memo()
+PAGINAS = ["pages/2_Graficas.py", "pages/3_Isocuantas.py", "pages/4_Largo_Plazo.py",
+           "pages/5_v1.py", "pages/6_v2.py"]
+
+
+def _ejes(at):
+    # {id: (etiqueta, valor inicial, paso, mínimo, máximo, entero)}
+    ejes = {}
+    for w in at.number_input:
+        p = w.proto
+        ejes[w.id] = (w.label, w.value, w.step, p.min if p.has_min else None,
+                      p.max if p.has_max else None, p.data_type == 0)
+    for w in at.slider:
+        p = w.proto
+        if p.data_type > 1 or isinstance(w.value, tuple):
+            continue
+        ejes[w.id] = (w.label, w.value, p.step, p.min, p.max, p.data_type == 0)
+    return ejes
+
+
+def _valores(inicial, paso, lo, hi, entero, radio):
+    valores = []
+    for i in range(-radio, radio + 1):
+        v = inicial + i * paso
+        if (lo is not None and v < lo) or (hi is not None and v > hi):
+            continue
+        valores.append(int(round(v)) if entero else round(v, 9))
+    return valores
+
+
+def reticula(ejes, config, radio):
+    elegidos = config.get("ejes")
+    if elegidos is not None:
+        por_etiqueta = {e[0]: i for i, e in ejes.items()}
+        faltan = [e for e in elegidos if e not in por_etiqueta]
+        if faltan:
+            raise KeyError(f"Widgets que no existen en la página: {faltan}")
+        ejes = {por_etiqueta[e]: ejes[por_etiqueta[e]] for e in elegidos}
+    radio = config.get("radio", radio)
+    base = {i: e[1] for i, e in ejes.items()}
+    valores = {i: _valores(e[1], e[2], e[3], e[4], e[5], radio) for i, e in ejes.items()}
+
+    if config.get("modo", "estrella") == "producto":
+        ids = list(valores)
+        return [dict(zip(ids, combinacion)) for combinacion in itertools.product(*valores.values())]
+    puntos = [base]
+    for i, vals in valores.items():
+        puntos += [dict(base, **{i: v}) for v in vals if v != base[i]]
+    return puntos
+
+
+def _fijar(at, punto):
+    for w in list(at.number_input) + list(at.slider):
+        if w.id in punto and w.value != punto[w.id]:
+            w.set_value(punto[w.id])
+
+
+def construir_pagina(pagina, config, radio, timeout):
+    at = AppTest.from_file(os.path.join(RAIZ, pagina), default_timeout=timeout)
+    at.run()
+    if at.exception:
+        raise RuntimeError(f"{pagina}: {at.exception[0].value}")
+    puntos = reticula(_ejes(at), config, radio)
+    errores = 0
+    for punto in puntos:
+        _fijar(at, punto)
+        at.run()
+        errores += bool(at.exception)
+    return len(puntos), errores
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precalcula resultados y figuras en el atlas en disco.")
+    parser.add_argument("--paginas", nargs="+", default=PAGINAS, help="Rutas relativas a la raíz del repositorio")
+    parser.add_argument("--radio", type=int, default=1, help="Pasos a cada lado del valor inicial")
+    parser.add_argument("--config", help="JSON con la retícula de cada página")
+    parser.add_argument("--directorio", default=atlas.DIRECTORIO)
+    parser.add_argument("--limpiar", action="store_true", help="Borrar objetos que ya no usa el índice")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Segundos máximos por ejecución")
+    args = parser.parse_args(argv)
+
+    configs = {}
+    if args.config:
+        with open(args.config, encoding="utf-8") as f:
+            configs = json.load(f)
+
+    t0 = time.perf_counter()
+    with atlas.grabando() as grabados:
+        for pagina in args.paginas:
+            antes = len(grabados)
+            t = time.perf_counter()
+            puntos, errores = construir_pagina(pagina, configs.get(pagina, {}), args.radio, args.timeout)
+            print(f"{pagina:28s} {puntos:5d} puntos  {len(grabados) - antes:5d} entradas  "
+                  f"{time.perf_counter() - t:7.1f} s  errores {errores}", flush=True)
+
+    meta = atlas.guardar(grabados, args.directorio, limpiar=args.limpiar,
+                         paginas=args.paginas, radio=args.radio, config=configs)
+    print(f"{meta['entradas']} entradas, {meta['objetos']} objetos "
+          f"({meta['bytes_objetos'] / 1e6:.1f} MB), {meta['borrados']} borrados, "
+          f"{time.perf_counter() - t0:.1f} s -> {args.directorio}")
+    return meta
+
+
+if __name__ == "__main__":
+    main()
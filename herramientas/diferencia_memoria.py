@@ -0,0 +1,33 @@
+import argparse
+import os
+import sys
+import tracemalloc
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from modelos.memoria import diferencia  # noqa: E402
+
+# Compara dos snapshots guardados por la medición de memoria de una página
+# (?perfil=memoria) y muestra los sitios del código que más crecieron:
+#
+#   python -m herramientas.diferencia_memoria tmp/perfiles/2_Graficas_A.tracemalloc \
+#       tmp/perfiles/2_Graficas_B.tracemalloc --top 20
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Diferencia entre dos snapshots de tracemalloc, por sitio del código.")
+    parser.add_argument("antes", help="Snapshot anterior (.tracemalloc)")
+    parser.add_argument("despues", help="Snapshot posterior (.tracemalloc)")
+    parser.add_argument("--top", type=int, default=20, help="Sitios a mostrar")
+    args = parser.parse_args(argv)
+
+    tabla = diferencia(tracemalloc.Snapshot.load(args.despues), tracemalloc.Snapshot.load(args.antes), args.top)
+    total = tabla["Crecimiento (KB)"].sum()
+    print(tabla.round(1).to_string(index=False))
+    print(f"\nCrecimiento de los {len(tabla)} sitios mostrados: {total / 1024:.2f} MB")
+    return tabla
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+import argparse
+import csv
+import glob
+import json
+import logging
+import multiprocessing as mp
+import os
+import queue
+import random
+import sys
+import threading
+import time
+
+import numpy as np
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+# Prueba de carga sin navegador: N sesiones simuladas por página, cada una con
+# su propio AppTest en su propio proceso. AppTest.run() pone y quita el
+# Runtime global de Streamlit, así que dos AppTest en hilos del mismo proceso
+# se pisan. Por eso las sesiones no comparten st.cache_resource, el pool de
+# render ni el especulador como en el servidor: la prueba mide la competencia
+# por CPU y memoria, no el beneficio de esas cachés. En cada rerun se cambian
+# al azar unos cuantos widgets dentro de su rango declarado; los number_input
+# sin mínimo o máximo se mueven alrededor de su valor inicial. Los botones no
+# se presionan.
+#
+# Un rerun cuenta como error si la página lanzó una excepción, si Streamlit
+# registró un error o si murió algún hilo (p. ej. el del script) con una excepción.
+#
+#   python -m herramientas.prueba_carga --sesiones 8 --reruns 10 \
+#       --paginas pages/3_Isocuantas.py pages/7_Varian.py --json carga.json --csv carga.csv
+#
+# Por página reporta latencia de rerun (p50/p95/p99), reruns por segundo y el
+# pico de RSS de este proceso más sus hijos (las sesiones y sus procesos de render).
+
+PAGINAS = ["Home.py"] + sorted(glob.glob("pages/*.py", root_dir=RAIZ))
+
+
+def _rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for linea in f:
+                if linea.startswith("VmRSS:"):
+                    return int(linea.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def _descendientes(pid):
+    hijos = []
+    for tarea in glob.glob(f"/proc/{pid}/task/*/children"):
+        try:
+            with open(tarea) as f:
+                hijos += [int(p) for p in f.read().split()]
+        except OSError:
+            continue
+    return hijos + [n for h in hijos for n in _descendientes(h)]
+
+
+def rss_total_mb():
+    pid = os.getpid()
+    return _rss_mb(pid) + sum(_rss_mb(h) for h in _descendientes(pid))
+
+
+class MuestreoRSS:
+    def __init__(self, intervalo=0.05):
+        self.intervalo = intervalo
+        self.pico = rss_total_mb()
+        self._fin = threading.Event()
+        self._hilo = threading.Thread(target=self._muestrear, daemon=True)
+
+    def _muestrear(self):
+        while not self._fin.wait(self.intervalo):
+            self.pico = max(self.pico, rss_total_mb())
+
+    def __enter__(self):
+        self._hilo.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._fin.set()
+        self._hilo.join()
+        self.pico = max(self.pico, rss_total_mb())
+
+
+def _en_rango(rng, lo, hi, paso, entero):
+    v = rng.uniform(lo, hi)
+    if paso:
+        v = min(lo + round((v - lo) / paso) * paso, hi)
+    return int(round(v)) if entero else float(v)
+
+
+def _rango_numero(w, inicial):
+    p = w.proto
+    ancho = max(abs(inicial), 1.0)
+    lo = p.min if p.has_min else inicial - ancho
+    hi = p.max if p.has_max else inicial + ancho
+    # Sin mínimo declarado, no se cruza el cero si el valor inicial es positivo
+    if not p.has_min and inicial > 0:
+        lo = max(lo, 0.0)
+    return lo, hi
+
+
+def _cambios_posibles(at, iniciales, rng):
+    cambios = []
+    for w in at.number_input:
+        inicial = iniciales.setdefault(w.id, w.value)
+        lo, hi = _rango_numero(w, inicial)
+        entero = w.proto.data_type == 0
+        cambios.append(lambda w=w, lo=lo, hi=hi, e=entero: w.set_value(_en_rango(rng, lo, hi, w.step, e)))
+    for w in at.slider:
+        p = w.proto
+        if p.data_type > 1 or isinstance(w.value, tuple):
+            continue
+        entero = p.data_type == 0
+        cambios.append(lambda w=w, p=p, e=entero: w.set_value(_en_rango(rng, p.min, p.max, p.step, e)))
+    for w in list(at.checkbox) + list(at.toggle):
+        cambios.append(lambda w=w: w.set_value(not w.value))
+    for w in at.selectbox:
+        # Con format_func, AppTest no puede elegir por índice: solo se conocen
+        # las etiquetas, no los valores originales
+        if w.options and str(w.format_func(w.value)) == str(w.value):
+            cambios.append(lambda w=w: w.select_index(rng.randrange(len(w.options))))
+    for w in at.radio:
+        if w.options:
+            cambios.append(lambda w=w: w.set_value(w.options[rng.randrange(len(w.options))]))
+    return cambios
+
+
+class RegistroErrores(logging.Handler):
+    # Errores que Streamlit registra y excepciones que matan un hilo (los
+    # loggers de Streamlit no propagan a la raíz: el handler se agrega a cada uno)
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.mensajes = []
+        threading.excepthook = lambda a: self.mensajes.append(f"{a.exc_type.__name__}: {a.exc_value}")
+
+    def emit(self, registro):
+        self.mensajes.append(registro.getMessage())
+
+    def escuchar(self):
+        for nombre, logger in list(logging.root.manager.loggerDict.items()):
+            if nombre.startswith("streamlit") and isinstance(logger, logging.Logger) and self not in logger.handlers:
+                logger.addHandler(self)
+
+
+def _sesion(pagina, reruns, cambios_por_rerun, semilla, timeout, inicio, resultados):
+    rng = random.Random(semilla)
+    latencias, errores, primer_error = [], 0, None
+    iniciales = {}
+    registro = RegistroErrores()
+    at = AppTest.from_file(os.path.join(RAIZ, pagina), default_timeout=timeout)
+    try:
+        inicio.wait()
+    except threading.BrokenBarrierError:
+        pass
+    for i in range(reruns):
+        if i > 0:
+            cambios = _cambios_posibles(at, iniciales, rng)
+            for cambio in rng.sample(cambios, min(cambios_por_rerun, len(cambios))):
+                cambio()
+        registro.escuchar()
+        registro.mensajes.clear()
+        t0 = time.perf_counter()
+        try:
+            at.run()
+            fallas = [e.value for e in at.exception] + registro.mensajes
+        except Exception as e:
+            # Tiempo agotado u otro fallo del propio rerun
+            fallas = [repr(e)]
+        latencias.append(time.perf_counter() - t0)
+        if fallas:
+            errores += 1
+            primer_error = primer_error or fallas[0]
+    resultados.put((latencias, errores, primer_error))
+    resultados.close()
+    resultados.join_thread()
+    # Los procesos de render de la sesión siguen vivos dentro de
+    # st.cache_resource y el cierre normal del intérprete se quedaría esperándolos
+    for hijo in mp.active_children():
+        hijo.terminate()
+        hijo.join()
+    os._exit(0)
+
+
+def probar_pagina(pagina, sesiones, reruns, cambios_por_rerun=2, semilla=0, timeout=120):
+    ctx = mp.get_context("spawn")
+    resultados = ctx.Queue()
+    # Todas las sesiones (y este proceso) empiezan juntas, ya importadas
+    inicio = ctx.Barrier(sesiones + 1, timeout=timeout)
+    procesos = [
+        ctx.Process(target=_sesion, args=(pagina, reruns, cambios_por_rerun,
+                                          semilla * 10_000 + i, timeout, inicio, resultados))
+        for i in range(sesiones)
+    ]
+    rss_base = rss_total_mb()
+    with MuestreoRSS() as rss:
+        for p in procesos:
+            p.start()
+        try:
+            inicio.wait()
+        except threading.BrokenBarrierError:
+            pass
+        t0 = time.perf_counter()
+        # Una sesión que muere sin reportar cuenta con todos sus reruns como errores
+        listas = []
+        while len(listas) < sesiones:
+            try:
+                listas.append(resultados.get(timeout=1.0))
+            except queue.Empty:
+                if not any(p.is_alive() for p in procesos) and resultados.empty():
+                    break
+        duracion = time.perf_counter() - t0
+        for p in procesos:
+            p.join()
+    caidas = sesiones - len(listas)
+    resultados = listas + [([], reruns, "La sesión terminó sin reportar")] * caidas
+
+    lat = np.array([x for lats, _, _ in resultados for x in lats]) * 1000
+    primeros = [e for _, _, e in resultados if e]
+    p50, p95, p99 = np.percentile(lat, [50, 95, 99]) if lat.size else (np.nan,) * 3
+    return {
+        "pagina": pagina,
+        "sesiones": sesiones,
+        "reruns": int(lat.size),
+        "errores": int(sum(e for _, e, _ in resultados)),
+        "p50_ms": round(float(p50), 1),
+        "p95_ms": round(float(p95), 1),
+        "p99_ms": round(float(p99), 1),
+        "max_ms": round(float(lat.max()), 1) if lat.size else None,
+        "reruns_por_s": round(lat.size / duracion, 2) if duracion > 0 else None,
+        "rss_base_mb": round(rss_base, 1),
+        "rss_pico_mb": round(rss.pico, 1),
+        "duracion_s": round(duracion, 2),
+        "primer_error": primeros[0] if primeros else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga de las páginas con sesiones simuladas (AppTest).")
+    parser.add_argument("--paginas", nargs="+", default=PAGINAS, help="Rutas relativas a la raíz del repositorio")
+    parser.add_argument("--sesiones", type=int, default=4, help="Sesiones simultáneas por página")
+    parser.add_argument("--reruns", type=int, default=5, help="Reruns por sesión (el primero es la carga inicial)")
+    parser.add_argument("--cambios", type=int, default=2, help="Widgets que cambian en cada rerun")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=120.0, help="Segundos máximos por rerun")
+    parser.add_argument("--json", help="Archivo JSON de salida")
+    parser.add_argument("--csv", help="Archivo CSV de salida")
+    args = parser.parse_args(argv)
+
+    filas = []
+    for pagina in args.paginas:
+        fila = probar_pagina(pagina, args.sesiones, args.reruns, args.cambios, args.semilla, args.timeout)
+        filas.append(fila)
+        print(f"{pagina:28s} p50 {fila['p50_ms']:8.1f} ms  p95 {fila['p95_ms']:8.1f} ms  "
+              f"p99 {fila['p99_ms']:8.1f} ms  {fila['reruns_por_s']:6.2f} reruns/s  "
+              f"RSS {fila['rss_pico_mb']:7.1f} MB  errores {fila['errores']}", flush=True)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"parametros": vars(args), "paginas": filas}, f, ensure_ascii=False, indent=2)
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            escritor = csv.DictWriter(f, fieldnames=list(filas[0]))
+            escritor.writeheader()
+            escritor.writerows(filas)
+    return filas
+
+
+if __name__ == "__main__":
+    main()
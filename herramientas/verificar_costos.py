@@ -0,0 +1,56 @@
+import argparse
+import itertools
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modelos.costos import ModeloCostos  # noqa: E402
+
+# Compara los mínimos exactos de ModeloCostos.minimos() (raíces por tramos)
+# contra el argmin de una malla densa, con y sin penalización por capacidad:
+#
+#   python -m herramientas.verificar_costos --puntos 2000001
+#
+# Termina con código 1 si algún mínimo no coincide.
+
+CAPACIDADES = (np.inf, 10.0, 15.0, 25.0, 40.0)
+KAPPAS = (0.1, 0.5, 2.0)
+POTENCIAS = (1, 2, 3)
+
+
+def casos():
+    base = dict(CF=200.0, base=8.0, curvatura=0.015, y_min=20.0)
+    for p, cap, kappa in itertools.product(POTENCIAS, CAPACIDADES, KAPPAS):
+        yield p, cap, kappa, ModeloCostos.desde_cvme(**base, capacidad=cap, kappa=kappa, potencia=p)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mínimos exactos de CMg, CVMe y CMe contra una malla densa.")
+    parser.add_argument("--y-max", type=float, default=100.0)
+    parser.add_argument("--puntos", type=int, default=2_000_001)
+    args = parser.parse_args(argv)
+
+    y = np.linspace(args.y_max / args.puntos, args.y_max, args.puntos)
+    # Tolerancia en y: unos pasos de la malla
+    tol = 5 * (y[1] - y[0])
+    fallas = 0
+    print(f"{'p':>2s} {'cap':>6s} {'κ':>5s} {'curva':5s} {'exacto':>9s} {'malla':>9s}  igual")
+    for p, cap, kappa, modelo in casos():
+        exactos = modelo.minimos()
+        curvas = modelo.evaluar(y)
+        for nombre, y_exacto in exactos.items():
+            y_malla = y[np.argmin(curvas[nombre][0])]
+            igual = abs(y_exacto[0] - y_malla) <= tol
+            fallas += not igual
+            print(f"{p:2d} {cap:6g} {kappa:5g} {nombre:5s} {y_exacto[0]:9.4f} {y_malla:9.4f}  {'sí' if igual else 'NO'}")
+
+    if fallas:
+        print(f"{fallas} mínimos no coinciden (tolerancia {tol:g})")
+    return 1 if fallas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
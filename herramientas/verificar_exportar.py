@@ -0,0 +1,81 @@
+import argparse
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modelos.exportar import a_arrow, a_npz, leer_arrow, leer_npz  # noqa: E402
+
+# Escribe columnas de varios dtypes con a_npz / a_arrow, las vuelve a leer con
+# leer_npz / leer_arrow y compara dtype y valores, bit a bit:
+#
+#   python -m herramientas.verificar_exportar --filas 100000
+#
+# Termina con código 1 si alguna columna cambia de dtype o de valores.
+
+
+def columnas(filas, semilla):
+    rng = np.random.default_rng(semilla)
+    buffer = rng.normal(size=(3, 2 * filas))
+    return {
+        "L": np.linspace(0.1, 100.0, filas),
+        "Q": rng.lognormal(size=filas).astype(np.float32),
+        "t": np.arange(filas, dtype=np.int64),
+        "n": rng.integers(0, 1000, size=filas, dtype=np.int32),
+        "cerca": rng.random(filas) < 0.5,
+        # Vista no contigua de un buffer más grande, como los cuantiles de acumulación
+        "p50": buffer[1, ::2],
+        "extremos": np.array([np.nan, np.inf, -np.inf, -0.0] * (filas // 4 + 1))[:filas],
+    }
+
+
+def comparar(originales, leidas):
+    fallas = []
+    for nombre, v in originales.items():
+        v = np.asarray(v)
+        w = leidas[nombre]
+        if w.dtype != v.dtype:
+            fallas.append(f"{nombre}: dtype {v.dtype} -> {w.dtype}")
+        elif w.shape != v.shape or np.ascontiguousarray(w).tobytes() != np.ascontiguousarray(v).tobytes():
+            fallas.append(f"{nombre}: valores distintos")
+    return fallas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ida y vuelta de la exportación binaria (.npz y Arrow IPC).")
+    parser.add_argument("--filas", type=int, default=100_000)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    cols = columnas(args.filas, args.semilla)
+    fallas = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for ext, escribir in (("npz", a_npz), ("arrow", a_arrow)):
+            ruta = os.path.join(tmp, f"columnas.{ext}")
+            with open(ruta, "wb") as f:
+                f.write(escribir(cols))
+            if ext == "npz":
+                with leer_npz(ruta) as archivo:
+                    leidas = {n: archivo[n] for n in archivo.files}
+            else:
+                tabla = leer_arrow(ruta)
+                leidas = {n: tabla.column(n).to_numpy() for n in tabla.column_names}
+
+            faltan = sorted(set(cols) - set(leidas))
+            errores = comparar({n: v for n, v in cols.items() if n in leidas}, leidas)
+            errores += [f"{n}: falta" for n in faltan]
+            fallas += len(errores)
+            print(f"{ext:6s} {os.path.getsize(ruta) / 1024:9.0f} KB  {'ok' if not errores else 'FALLA'}")
+            for e in errores:
+                print(f"    {e}")
+
+    if fallas:
+        print(f"{fallas} columnas no conservan dtype o valores")
+    return 1 if fallas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+import functools
+import os
+
+import numpy as np
+
+from modelos import cobb, rendimientos
+
+# Versiones compiladas (Numba) de los kernels de producción y break-even
+# para barridos grandes. Cada una es un solo ciclo fusionado:
+# no crea un arreglo temporal por cada **, * o /, y las que son elemento a
+# elemento se reparten entre los núcleos. Si Numba no está instalado, si
+# ACELERADO=0 o si el arreglo es chico (la compilación y los hilos no se
+# pagan), se usan las versiones de NumPy de modelos/cobb.py y
+# modelos/rendimientos.py con los mismos argumentos y resultados.
+#
+# Equivalencia y tiempos:  python -m herramientas.benchmark_acelerado
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+ACTIVO = numba is not None and os.environ.get("ACELERADO", "1") != "0"
+# Elementos a partir de los cuales conviene el kernel compilado
+UMBRAL = int(os.environ.get("ACELERADO_UMBRAL", 100_000))
+HILOS = numba.config.NUMBA_NUM_THREADS if numba is not None else 1
+# Las potencias de NumPy 2 ya usan SIMD y en un solo núcleo le ganan al ciclo
+# compilado; produccion_cobb solo compensa repartida entre varios núcleos.
+MIN_HILOS_POTENCIA = 4
+
+_F8 = "float64"
+
+
+@functools.cache
+def _kernels():
+    # Se compilan la primera vez que se usan, no al importar el módulo
+    @numba.vectorize([f"{_F8}({_F8}, {_F8}, {_F8}, {_F8}, {_F8})"], target="parallel")
+    def produccion(A, K, L, a, b):
+        return A * (K ** a) * (L ** b)
+
+    @numba.njit(cache=True)
+    def break_even(L, CM, P, raices):
+        n = 0
+        for i in range(len(L) - 1):
+            y0 = CM[i] - P
+            y1 = CM[i + 1] - P
+            if (y0 < 0 and y1 > 0) or (y0 > 0 and y1 < 0):
+                raices[n] = L[i] - y0 * (L[i + 1] - L[i]) / (y1 - y0)
+                n += 1
+        return n
+
+    return produccion, break_even
+
+
+def _usar(*arrays):
+    return ACTIVO and max(np.size(x) for x in arrays) >= UMBRAL
+
+
+def produccion_cobb(A, K, L, a, b):
+    if HILOS < MIN_HILOS_POTENCIA or not _usar(A, K, L, a, b):
+        return cobb.produccion_cobb(A, K, L, a, b)
+    return _kernels()[0](A, K, L, a, b)
+
+
+def find_break_even(L_vals, CM_vals, P):
+    if not _usar(L_vals, CM_vals):
+        return rendimientos.find_break_even(L_vals, CM_vals, P)
+    L_vals = np.ascontiguousarray(L_vals, dtype=np.float64)
+    CM_vals = np.ascontiguousarray(CM_vals, dtype=np.float64)
+    raices = np.empty(max(len(L_vals) - 1, 0))
+    n = _kernels()[1](L_vals, CM_vals, float(P), raices)
+    return raices[:n].tolist()
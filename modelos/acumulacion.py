@@ -0,0 +1,146 @@
+import os
+
+import numpy as np
+
+# Acumulación de capital con la función Cobb-Douglas de modelos/cobb.py y
+# choques de productividad:
+#
+#   K_{t+1} = s · A·e^{z_t} · K_t^a · L^b + (1 − δ) · K_t
+#   z_{t+1} = ρ · z_t + σ · ε_{t+1},   ε ~ N(0, 1)
+#
+# Todos los caminos avanzan juntos: cada periodo es una sola operación sobre
+# el arreglo de caminos. simular() es un generador que entrega los resultados
+# por bloques de periodos (cuantiles entre caminos, media, etc.); solo se
+# guarda el bloque actual, así que 10^5 caminos × 10^4 periodos no necesitan
+# la matriz completa (8 GB) en memoria.
+
+# Memoria para los dos arreglos de un bloque (choques y capital por periodo)
+MAX_BLOQUE_MB = float(os.environ.get("ACUMULACION_MAX_BLOQUE_MB", 64))
+CUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+N_MUESTRA = 20
+
+
+def estado_estacionario(A, a, b, L, s, delta):
+    # K* sin choques: s·A·K^a·L^b = δ·K
+    if a >= 1 or s <= 0 or delta <= 0:
+        return np.inf
+    return (s * A * L ** b / delta) ** (1 / (1 - a))
+
+
+def velocidad_convergencia(a, delta):
+    # Cerca de K*, la brecha se multiplica por 1 − (1 − a)·δ en cada periodo
+    tasa = (1 - a) * delta
+    if not 0 < tasa < 1:
+        return tasa, np.inf
+    return tasa, np.log(0.5) / np.log(1 - tasa)
+
+
+def periodos_por_bloque(n_caminos, max_mb=MAX_BLOQUE_MB):
+    return max(1, int(max_mb * 1024 ** 2 // (2 * 8 * n_caminos)))
+
+
+def simular(A, a, b, L, K0, s, delta, rho, sigma, n_caminos, periodos, semilla=0,
+            cuantiles=CUANTILES, tolerancia=0.05, n_muestra=N_MUESTRA, max_bloque_mb=MAX_BLOQUE_MB):
+    # Entrega un dict por bloque con los periodos t, los cuantiles de K entre
+    # caminos (len(cuantiles) × periodos del bloque), media, desviación, la
+    # fracción de caminos a menos de `tolerancia` de K* y unos caminos de
+    # muestra. El último bloque trae además K_final (todos los caminos en t = periodos).
+    rng = np.random.default_rng(semilla)
+    n_caminos = int(n_caminos)
+    K = np.full(n_caminos, float(K0))
+    z = np.zeros(n_caminos)
+    escala = s * A * L ** b
+    K_est = estado_estacionario(A, a, b, L, s, delta)
+
+    T = min(periodos_por_bloque(n_caminos, max_bloque_mb), periodos + 1)
+    K_bloque = np.empty((T, n_caminos))
+    choques = np.empty((T, n_caminos))
+    prod = np.empty(n_caminos)
+    factor = np.empty(n_caminos)
+
+    t = 0
+    while t <= periodos:
+        m = min(T, periodos + 1 - t)
+        Kb, eb = K_bloque[:m], choques[:m]
+        rng.standard_normal(out=eb)
+        eb *= sigma
+        for i in range(m):
+            Kb[i] = K
+            # Sin temporales: cada operación escribe en un arreglo ya reservado
+            np.exp(z, out=factor)
+            np.power(K, a, out=prod)
+            prod *= factor
+            prod *= escala
+            K *= 1 - delta
+            K += prod
+            z *= rho
+            z += eb[i]
+
+        bloque = {
+            "t": np.arange(t, t + m),
+            "cuantiles": np.quantile(Kb, cuantiles, axis=1),
+            "media": Kb.mean(axis=1),
+            "desv": Kb.std(axis=1),
+            "cerca": (np.mean(np.abs(Kb - K_est) <= tolerancia * K_est, axis=1)
+                      if np.isfinite(K_est) else np.zeros(m)),
+            "muestra": Kb[:, :n_muestra].T.copy(),
+        }
+        t += m
+        if t > periodos:
+            bloque["K_final"] = Kb[-1].copy()
+        yield bloque
+
+
+class Trayectorias:
+    # Junta los bloques de simular(); solo guarda resúmenes por periodo. Cada
+    # resumen vive en un arreglo con el tiempo en el último eje que se llena
+    # en su lugar (y duplica su capacidad si hace falta), así que agregar un
+    # bloque no copia los anteriores y leer un resumen no arma arreglos nuevos.
+    def __init__(self, periodos=None, cuantiles=CUANTILES):
+        self.cuantiles = tuple(cuantiles)
+        self.n = 0
+        self._capacidad = 0 if periodos is None else periodos + 1
+        self._datos = {}
+        self.K_final = None
+
+    def agregar(self, bloque):
+        m = len(bloque["t"])
+        if self.n + m > self._capacidad or not self._datos:
+            self._capacidad = max(self.n + m, 2 * self._capacidad if self._datos else self._capacidad)
+            for nombre, v in bloque.items():
+                if nombre == "K_final":
+                    continue
+                nuevo = np.empty(v.shape[:-1] + (self._capacidad,), dtype=v.dtype)
+                if nombre in self._datos:
+                    nuevo[..., :self.n] = self._datos[nombre][..., :self.n]
+                self._datos[nombre] = nuevo
+        for nombre, datos in self._datos.items():
+            datos[..., self.n:self.n + m] = bloque[nombre]
+        self.n += m
+        if "K_final" in bloque:
+            self.K_final = bloque["K_final"]
+
+    def __getitem__(self, nombre):
+        return self._datos[nombre][..., :self.n]
+
+    def resumen(self, K0, K_est, tolerancia=0.05, cola=0.2):
+        t, media = self["t"], self["media"]
+        mediana = self["cuantiles"][self.cuantiles.index(0.5)] if 0.5 in self.cuantiles else None
+        # Estado estacionario con choques: promedio de la última parte del horizonte
+        n_cola = max(1, int(len(t) * cola))
+        K_largo = float(media[-n_cola:].mean())
+
+        def primero(mascara):
+            i = np.flatnonzero(mascara)
+            return int(t[i[0]]) if i.size else None
+
+        brecha = abs(K0 - K_largo)
+        return {
+            "K_largo_plazo": K_largo,
+            "desv_largo_plazo": float(self["desv"][-n_cola:].mean()),
+            # Periodos hasta cerrar la mitad de la brecha inicial (media de los caminos)
+            "vida_media": primero(np.abs(media - K_largo) <= 0.5 * brecha) if brecha > 0 else 0,
+            "llegada_mediana": (primero(np.abs(mediana - K_est) <= tolerancia * K_est)
+                                if mediana is not None and np.isfinite(K_est) else None),
+            "cerca_final": float(self["cerca"][-1]),
+        }
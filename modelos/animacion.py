@@ -0,0 +1,203 @@
+import io
+import zipfile
+
+import matplotlib
+import matplotlib.style
+import numpy as np
+import streamlit as st
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import GifImagePlugin, Image
+
+from modelos.cobb import produccion_cobb
+
+# Animaciones de estática comparativa: un parámetro (A, a o b) recorre N
+# valores y se exporta un GIF o una secuencia de PNG. La figura se arma una
+# sola vez; en cada cuadro solo se actualizan los datos de las líneas y se
+# redibujan sobre el fondo guardado. Cada cuadro se codifica y se escribe al
+# destino en cuanto se dibuja, así que nunca se guarda la pila completa.
+
+PARAMETROS = {
+    "b": "Elasticidad del Trabajo (b)",
+    "a": "Elasticidad del Capital (a)",
+    "A": "Eficiencia total (A)",
+}
+
+PANELES = {
+    "Q": "Producción Q(L)",
+    "PMg_L": "Producto Marginal del Trabajo (PMg_L)",
+    "isocuantas": "Isocuantas Cobb-Douglas",
+}
+
+FORMATOS = {
+    "GIF animado": ("gif", "image/gif"),
+    "Secuencia PNG (.zip)": ("zip", "application/zip"),
+}
+
+
+class EscritorGIF:
+    def __init__(self, destino, fps):
+        self.destino = destino
+        self.duracion = int(round(1000 / fps))
+        self._paleta = None
+
+    def agregar(self, rgb):
+        im = Image.fromarray(rgb)
+        if self._paleta is None:
+            # La paleta global sale del primer cuadro: los colores de las
+            # curvas no cambian entre cuadros.
+            self._paleta = im.quantize(colors=256)
+            encabezado, _ = GifImagePlugin.getheader(self._paleta, info={"loop": 0})
+            for trozo in encabezado:
+                self.destino.write(trozo)
+        cuadro = im.quantize(palette=self._paleta, dither=Image.Dither.NONE)
+        for trozo in GifImagePlugin.getdata(cuadro, duration=self.duracion):
+            self.destino.write(trozo)
+
+    def cerrar(self):
+        self.destino.write(b";")
+
+
+class EscritorPNG:
+    def __init__(self, destino, fps):
+        # Los PNG ya vienen comprimidos; el zip solo los empaqueta
+        self._zip = zipfile.ZipFile(destino, "w", compression=zipfile.ZIP_STORED)
+        self._i = 0
+
+    def agregar(self, rgb):
+        buf = io.BytesIO()
+        Image.fromarray(rgb).save(buf, format="png", compress_level=1)
+        self._zip.writestr(f"cuadro_{self._i:04d}.png", buf.getvalue())
+        self._i += 1
+
+    def cerrar(self):
+        self._zip.close()
+
+
+ESCRITORES = {"gif": EscritorGIF, "zip": EscritorPNG}
+
+
+def sin_isocuantas(b, parametro, valores):
+    # Con b = 0 el trabajo no cambia Q: no hay isocuanta L(K) que despejar
+    return bool(np.any(np.asarray(valores if parametro == "b" else b) <= 0))
+
+
+def _curvas(A, a, b, K, L, parametro, valores, paneles, niveles_rel=(0.4, 0.7, 1.0, 1.5, 2.0)):
+    # Curvas de todos los cuadros en una sola evaluación, forma (cuadros, puntos)
+    p = {"A": A, "a": a, "b": b}
+    p[parametro] = valores[:, np.newaxis]
+
+    L_vals = np.linspace(1, L * 3, 100)
+    K_vals = np.linspace(1, K * 3, 100)
+    curvas = {}
+
+    Q_L = produccion_cobb(p["A"], K, L_vals, p["a"], p["b"])
+    if "Q" in paneles:
+        curvas["Q"] = (L_vals, [Q_L])
+    if "PMg_L" in paneles:
+        curvas["PMg_L"] = (L_vals, [p["b"] * Q_L / L_vals])
+    if "isocuantas" in paneles:
+        # Niveles fijos (los de los parámetros actuales de la página) para ver
+        # cómo se desplazan. Cada isocuanta: L = (Q / (A·K^a))^(1/b)
+        Q0 = produccion_cobb(A, K, L, a, b)
+        curvas["isocuantas"] = (K_vals, [
+            (Q0 * r / (p["A"] * K_vals ** p["a"])) ** (1 / p["b"]) for r in niveles_rel
+        ])
+    return curvas
+
+
+def _limites(familias):
+    datos = np.concatenate([np.ravel(y) for y in familias])
+    datos = datos[np.isfinite(datos)]
+    if datos.size == 0:
+        return 0, 1
+    y0, y1 = datos.min(), datos.max()
+    pad = 0.05 * (y1 - y0) if y1 != y0 else 1
+    return y0 - pad, y1 + pad
+
+
+def animar_cobb(destino, A, a, b, K, L, parametro, desde, hasta, n_cuadros,
+                paneles=("Q", "PMg_L"), formato="gif", fps=20, dpi=80):
+    valores = np.linspace(desde, hasta, int(n_cuadros))
+    if sin_isocuantas(b, parametro, valores):
+        paneles = tuple(p for p in paneles if p != "isocuantas")
+    if not paneles:
+        raise ValueError("No hay paneles que animar")
+    curvas = _curvas(A, a, b, K, L, parametro, valores, paneles)
+
+    with matplotlib.style.context("seaborn-v0_8"):
+        fig = Figure(figsize=(4.4 * len(paneles), 3.6), dpi=dpi, constrained_layout=True)
+        canvas = FigureCanvasAgg(fig)
+        axes = fig.subplots(1, len(paneles), squeeze=False)[0]
+
+        animadas = []
+        for ax, panel in zip(axes, paneles):
+            x, familias = curvas[panel]
+            for y in familias:
+                (linea,) = ax.plot(x, y[0], linewidth=2.0, animated=True)
+                animadas.append((ax, linea, y))
+            ax.set_title(PANELES[panel])
+            ax.set_xlim(x[0], x[-1])
+            if panel == "isocuantas":
+                ax.set_xlabel("Capital (K)")
+                ax.set_ylabel("Trabajo (L)")
+                ax.set_ylim(0, L * 3)
+            else:
+                ax.set_xlabel("Trabajo (L)")
+                ax.set_ylabel("Producción (Q)" if panel == "Q" else "PMg_L")
+                ax.set_ylim(*_limites(familias))
+            ax.grid(True)
+
+        texto = fig.text(0.99, 0.01, "", ha="right", va="bottom", animated=True)
+
+    # Fondo (ejes, rejilla, títulos) una sola vez; luego solo las curvas
+    canvas.draw()
+    fondo = canvas.copy_from_bbox(fig.bbox)
+
+    escritor = ESCRITORES[formato](destino, fps)
+    for i, v in enumerate(valores):
+        canvas.restore_region(fondo)
+        for ax, linea, y in animadas:
+            linea.set_ydata(y[i])
+            ax.draw_artist(linea)
+        texto.set_text(f"{parametro} = {v:.3f}")
+        fig.draw_artist(texto)
+        escritor.agregar(np.asarray(canvas.buffer_rgba())[..., :3])
+    escritor.cerrar()
+    return len(valores)
+
+
+def seccion_animacion(A, a, b, K, L, paneles, nombre_base):
+    with st.expander("Animación: estática comparativa"):
+        c1, c2, c3 = st.columns(3)
+        parametro = c1.selectbox("Parámetro que se mueve", list(PARAMETROS),
+                                 format_func=PARAMETROS.get, key=f"anim_param_{nombre_base}")
+        actual = {"A": A, "a": a, "b": b}[parametro]
+        desde = c2.number_input("Desde", value=max(round(actual * 0.5, 3), 0.01), min_value=0.01,
+                                key=f"anim_desde_{nombre_base}")
+        hasta = c3.number_input("Hasta", value=max(round(actual * 1.5, 3), 0.02), min_value=0.01,
+                                key=f"anim_hasta_{nombre_base}")
+
+        c4, c5, c6 = st.columns(3)
+        n_cuadros = c4.slider("Cuadros", 10, 600, 120, step=10, key=f"anim_n_{nombre_base}")
+        fps = c5.slider("Cuadros por segundo", 5, 30, 20, key=f"anim_fps_{nombre_base}")
+        formato = c6.radio("Formato", list(FORMATOS), key=f"anim_fmt_{nombre_base}")
+
+        if "isocuantas" in paneles and sin_isocuantas(b, parametro, np.array([desde, hasta])):
+            st.warning("Con b = 0 el trabajo no afecta la producción y no hay isocuantas: "
+                       "la animación se genera sin ese panel.")
+            paneles = tuple(p for p in paneles if p != "isocuantas")
+
+        if st.button("Generar animación", key=f"anim_btn_{nombre_base}"):
+            ext, mime = FORMATOS[formato]
+            buf = io.BytesIO()
+            with st.spinner("Generando cuadros…"):
+                animar_cobb(buf, A, a, b, K, L, parametro, desde, hasta, n_cuadros,
+                            paneles=paneles, formato=ext, fps=fps)
+            st.download_button(
+                f"Descargar {nombre_base}_{parametro}.{ext} ({len(buf.getvalue()) / 1024:.0f} KB)",
+                data=buf.getvalue(),
+                file_name=f"{nombre_base}_{parametro}.{ext}",
+                mime=mime,
+                on_click="ignore",
+            )
@@ -0,0 +1,229 @@
+import functools
+import glob
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import matplotlib
+import numpy as np
+
+# Atlas en disco de resultados ya calculados (PNG y arreglos) para las
+# combinaciones de parámetros más comunes, alrededor de los valores iniciales
+# de cada página. Se construye con
+#
+#   python -m herramientas.construir_atlas --radio 2
+#
+# y en el servidor resultado() (modelos/especulacion.py) y memo()
+# (modelos/modelo_cobb.py) lo consultan antes de calcular: un servidor recién
+# iniciado responde esas combinaciones sin recalcular nada.
+#
+# Los objetos se guardan por el SHA-256 de su contenido (objetos/ab/abcd...),
+# así que los valores repetidos ocupan un solo archivo. Un valor compuesto
+# (tupla o lista) es un pequeño JSON con los hashes de sus partes. El índice
+# es un arreglo ordenado de registros de 57 bytes (huella de la clave, hash del
+# objeto, tipo) en indice.npy, que se abre con mmap y se busca por bisección.
+# atlas.json guarda la firma del código con que se construyó: si el código o
+# las versiones de NumPy/Matplotlib cambian, el atlas se ignora.
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIRECTORIO = os.environ.get("ATLAS_DIR", os.path.join(RAIZ, "atlas"))
+ACTIVO = os.environ.get("ATLAS", "1") != "0"
+
+BYTES, ARREGLO, COMPUESTO = range(3)
+INDICE_DTYPE = np.dtype([("clave", "<u8"), ("verif", "<u8"), ("objeto", "u1", (32,)), ("tipo", "u1")])
+
+log = logging.getLogger(__name__)
+
+
+@functools.cache
+def firma():
+    h = hashlib.sha256()
+    for ruta in ["Home.py"] + sorted(glob.glob("modelos/*.py", root_dir=RAIZ) + glob.glob("pages/*.py", root_dir=RAIZ)):
+        h.update(ruta.encode())
+        with open(os.path.join(RAIZ, ruta), "rb") as f:
+            h.update(f.read())
+    h.update(f"numpy {np.__version__} matplotlib {matplotlib.__version__}".encode())
+    return h.hexdigest()
+
+
+def _normalizar(valor):
+    # Igual que en la caché especulativa: 0.5 + 0.05 y 0.55 son la misma clave
+    if isinstance(valor, (float, np.floating)):
+        return round(float(valor), 9)
+    if isinstance(valor, np.integer):
+        return int(valor)
+    if isinstance(valor, (tuple, list)):
+        return tuple(_normalizar(v) for v in valor)
+    if isinstance(valor, dict):
+        return tuple((n, _normalizar(v)) for n, v in sorted(valor.items()))
+    return valor
+
+
+def huella(clave):
+    # 16 bytes de SHA-256: los primeros 8 ordenan el índice, los otros 8
+    # confirman que no es una colisión
+    d = hashlib.sha256(repr(_normalizar(clave)).encode()).digest()
+    return int.from_bytes(d[:8], "little"), int.from_bytes(d[8:16], "little")
+
+
+def _ruta_objeto(directorio, digest):
+    h = digest.hex()
+    return os.path.join(directorio, "objetos", h[:2], h)
+
+
+class Atlas:
+    def __init__(self, directorio=DIRECTORIO):
+        self.directorio = directorio
+        with open(os.path.join(directorio, "atlas.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.indice = np.load(os.path.join(directorio, "indice.npy"), mmap_mode="r")
+        self.claves = self.indice["clave"]
+
+    def __len__(self):
+        return len(self.indice)
+
+    def _leer(self, tipo, digest):
+        ruta = _ruta_objeto(self.directorio, digest)
+        if tipo == ARREGLO:
+            # Solo lectura y sin copiar: las páginas comparten el mismo mapa
+            return np.load(ruta, mmap_mode="r", allow_pickle=False).view(np.ndarray)
+        with open(ruta, "rb") as f:
+            datos = f.read()
+        if tipo == BYTES:
+            return datos
+        compuesto = json.loads(datos)
+        partes = [self._leer(t, bytes.fromhex(h)) for t, h in compuesto["partes"]]
+        return partes if compuesto["lista"] else tuple(partes)
+
+    def buscar(self, clave):
+        c, v = huella(clave)
+        i = int(np.searchsorted(self.claves, c))
+        if i == len(self.claves) or self.claves[i] != c:
+            return None
+        fila = self.indice[i]
+        if int(fila["verif"]) != v:
+            return None
+        return self._leer(int(fila["tipo"]), bytes(fila["objeto"]))
+
+
+_lock = threading.Lock()
+_abierto = None  # (mtime de atlas.json, Atlas o None)
+_grabacion = None
+
+
+def obtener_atlas():
+    # Se vuelve a abrir si se reconstruyó mientras el servidor seguía arriba
+    global _abierto
+    try:
+        mtime = os.stat(os.path.join(DIRECTORIO, "atlas.json")).st_mtime_ns
+    except OSError:
+        return None
+    with _lock:
+        if _abierto is None or _abierto[0] != mtime:
+            try:
+                atlas = Atlas(DIRECTORIO)
+            except (OSError, ValueError) as e:
+                log.warning("No se pudo abrir el atlas en %s: %r", DIRECTORIO, e)
+                atlas = None
+            if atlas is not None and atlas.meta.get("firma") != firma():
+                log.warning("El atlas en %s es de otra versión del código; se ignora.", DIRECTORIO)
+                atlas = None
+            _abierto = (mtime, atlas)
+        return _abierto[1]
+
+
+def buscar(clave):
+    # None si no está (o si se está grabando: entonces todo se calcula)
+    if not ACTIVO or _grabacion is not None:
+        return None
+    atlas = obtener_atlas()
+    if atlas is None:
+        return None
+    try:
+        return atlas.buscar(clave)
+    except (OSError, ValueError) as e:
+        log.warning("Entrada dañada en el atlas: %r", e)
+        return None
+
+
+@contextmanager
+def grabando():
+    # Mientras dure, registrar() guarda cada resultado que sirven las páginas
+    global _grabacion
+    _grabacion = {}
+    try:
+        yield _grabacion
+    finally:
+        _grabacion = None
+
+
+def registrar(clave, valor):
+    if _grabacion is not None:
+        _grabacion[huella(clave)] = valor
+
+
+def _guardar_objeto(directorio, datos, usados):
+    digest = hashlib.sha256(datos).digest()
+    usados.add(digest)
+    ruta = _ruta_objeto(directorio, digest)
+    if not os.path.exists(ruta):
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        tmp = f"{ruta}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(datos)
+        os.replace(tmp, ruta)
+    return digest
+
+
+def _guardar_valor(directorio, valor, usados):
+    if isinstance(valor, bytes):
+        return BYTES, _guardar_objeto(directorio, valor, usados)
+    if isinstance(valor, np.ndarray):
+        buf = io.BytesIO()
+        np.save(buf, np.ascontiguousarray(valor), allow_pickle=False)
+        return ARREGLO, _guardar_objeto(directorio, buf.getvalue(), usados)
+    if isinstance(valor, (tuple, list)):
+        partes = [[t, d.hex()] for t, d in (_guardar_valor(directorio, p, usados) for p in valor)]
+        datos = json.dumps({"lista": isinstance(valor, list), "partes": partes}).encode()
+        return COMPUESTO, _guardar_objeto(directorio, datos, usados)
+    raise TypeError(f"El atlas no guarda valores de tipo {type(valor).__name__}")
+
+
+def guardar(entradas, directorio=DIRECTORIO, limpiar=False, **meta):
+    # `entradas` es {huella: valor}, p. ej. lo que deja grabando()
+    if not entradas:
+        raise ValueError("No hay entradas que guardar en el atlas")
+    usados = set()
+    filas = np.empty(len(entradas), dtype=INDICE_DTYPE)
+    for i, ((c, v), valor) in enumerate(sorted(entradas.items(), key=lambda e: e[0])):
+        tipo, digest = _guardar_valor(directorio, valor, usados)
+        filas[i] = (c, v, np.frombuffer(digest, dtype=np.uint8), tipo)
+
+    # El índice primero y atlas.json al final: su mtime avisa a los servidores
+    ruta = os.path.join(directorio, "indice.npy")
+    with open(ruta + ".tmp", "wb") as f:
+        np.save(f, filas, allow_pickle=False)
+    os.replace(ruta + ".tmp", ruta)
+
+    borrados = 0
+    if limpiar:
+        for archivo in glob.glob(os.path.join(directorio, "objetos", "*", "*")):
+            nombre = os.path.basename(archivo)
+            # También restos .tmp de una construcción interrumpida
+            if len(nombre) != 64 or bytes.fromhex(nombre) not in usados:
+                os.remove(archivo)
+                borrados += 1
+
+    tamano = sum(os.path.getsize(_ruta_objeto(directorio, d)) for d in usados)
+    meta = dict(meta, firma=firma(), creado=time.strftime("%Y-%m-%d %H:%M:%S"),
+                entradas=len(filas), objetos=len(usados), bytes_objetos=tamano)
+    ruta = os.path.join(directorio, "atlas.json")
+    with open(ruta + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    os.replace(ruta + ".tmp", ruta)
+    return dict(meta, borrados=borrados)
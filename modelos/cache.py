@@ -0,0 +1,30 @@
+import threading
+from collections import OrderedDict
+
+# Caché LRU en memoria, segura entre hilos. La usan el especulador
+# (modelos/especulacion.py) y el grafo de dependencias (modelos/flujo.py).
+
+
+class CacheResultados:
+    def __init__(self, max_entradas):
+        self.max_entradas = max_entradas
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obtener(self, clave):
+        with self._lock:
+            if clave not in self._datos:
+                return None
+            self._datos.move_to_end(clave)
+            return self._datos[clave]
+
+    def guardar(self, clave, valor):
+        with self._lock:
+            self._datos[clave] = valor
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.max_entradas:
+                self._datos.popitem(last=False)
+
+    def __contains__(self, clave):
+        with self._lock:
+            return clave in self._datos
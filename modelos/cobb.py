@@ -0,0 +1,12 @@
+# Función de producción Cobb-Douglas y sus productos marginales.
+# Funcionan igual con escalares o con arreglos de NumPy (broadcasting).
+
+
+def produccion_cobb(A, K, L, a, b):
+    return A * (K**a) * (L**b)
+
+def pmgL_cobb(A, K, L, a, b):
+    return A * b * (K**a) * (L**(b-1))
+
+def pmgK_cobb(A, K, L, a, b):
+    return A * a * (K**(a-1)) * (L**b)
@@ -0,0 +1,113 @@
+import numpy as np
+from numpy.polynomial import Polynomial
+
+# Modelo de costos definido por una sola función de costo total:
+#
+#   CT(y) = CF + c1·y + c2·y² + c3·y³ + κ·y·max(0, y − capacidad)^p
+#
+# El último término encarece cada unidad por encima de la capacidad máxima.
+# De CT salen CF, CV, CFM, CVMe, CMe y CMg en una sola evaluación sobre la
+# misma malla. Los parámetros pueden ser arreglos de longitud m para evaluar
+# m especificaciones a la vez: cada curva queda con forma (m, n).
+
+
+class ModeloCostos:
+    def __init__(self, CF, c1, c2, c3, capacidad=np.inf, kappa=0.0, potencia=2):
+        if int(potencia) != potencia or potencia < 1:
+            raise ValueError("La potencia de la penalización debe ser un entero ≥ 1")
+        self.potencia = int(potencia)
+
+        params = np.broadcast_arrays(*(np.atleast_1d(np.asarray(v, dtype=float))
+                                       for v in (CF, c1, c2, c3, capacidad, kappa)))
+        self.CF, self.c1, self.c2, self.c3, self.capacidad, self.kappa = params
+        self.m = len(self.CF)
+
+    def evaluar(self, y):
+        y = np.asarray(y, dtype=float)[np.newaxis, :]
+        col = lambda v: v[:, np.newaxis]
+        CF, c1, c2, c3 = col(self.CF), col(self.c1), col(self.c2), col(self.c3)
+        kappa, p = col(self.kappa), self.potencia
+
+        y2 = y * y
+        exceso = np.maximum(y - col(self.capacidad), 0.0)
+        exceso_p1 = exceso ** (p - 1) if p > 1 else (exceso > 0).astype(float)
+        exceso_p = exceso_p1 * exceso
+
+        CV = c1 * y + c2 * y2 + c3 * y2 * y + kappa * y * exceso_p
+        CMg = c1 + 2 * c2 * y + 3 * c3 * y2 + kappa * (exceso_p + p * y * exceso_p1)
+        CVMe = CV / y
+        CFM = CF / y
+        return {
+            "CF": np.broadcast_to(CF, CV.shape),
+            "CV": CV,
+            "CT": CF + CV,
+            "CFM": CFM,
+            "CVMe": CVMe,
+            "CMe": CFM + CVMe,
+            "CMg": CMg,
+        }
+
+    def _tramos(self, i, bajo, extra):
+        # La misma ecuación en cada tramo (debajo y encima de la capacidad).
+        # Encima se suma `extra`, que viene de la penalización.
+        cap = self.capacidad[i]
+        tramos = [(bajo, 0.0, cap)]
+        if self.kappa[i] != 0 and np.isfinite(cap):
+            tramos.append((bajo + extra, cap, np.inf))
+        return tramos
+
+    def _es_minimo_local(self, i, y, curva):
+        h = 1e-5 * max(y, 1.0)
+        f = self.evaluar([max(y - h, 1e-12), y, y + h])[curva][i]
+        tol = 1e-12 * max(abs(f[1]), 1.0)
+        return f[1] <= f[0] + tol and f[1] <= f[2] + tol
+
+    def _minimo(self, i, tramos, curva):
+        candidatos = []
+        for poli, desde, hasta in tramos:
+            if not np.any(poli.coef[1:]):
+                continue
+            for r in poli.roots():
+                if abs(r.imag) < 1e-9 and max(desde, 0.0) < r.real <= hasta:
+                    candidatos.append(r.real)
+
+        # En la capacidad la curva tiene un quiebre (o un salto si p = 1) que
+        # puede ser el mínimo
+        cap = self.capacidad[i]
+        if self.kappa[i] > 0 and np.isfinite(cap) and cap > 0:
+            candidatos.append(cap)
+
+        # Las raíces de la derivada también pueden ser máximos
+        candidatos = [y for y in candidatos if self._es_minimo_local(i, y, curva)]
+        if not candidatos:
+            return np.nan
+        valores = self.evaluar(candidatos)[curva][i]
+        return candidatos[int(np.argmin(valores))]
+
+    def minimos(self):
+        # Ubicación exacta (raíces de polinomios) del mínimo de cada curva.
+        # Como CMg corta a CVMe y a CMe en sus mínimos, también son los cruces.
+        # Con d = y − cap, encima de la capacidad:
+        #   CMg'  = 0  ⇔  2c2 + 6c3·y + κ·(2p·d^(p−1) + p(p−1)·y·d^(p−2)) = 0
+        #   CVMe' = 0  ⇔  c2 + 2c3·y + κp·d^(p−1) = 0
+        #   CMe'  = 0  ⇔  y·CMg − CT = c2·y² + 2c3·y³ − CF + κp·y²·d^(p−1) = 0
+        # (debajo, los mismos polinomios sin el término de κ).
+        res = {n: np.full(self.m, np.nan) for n in ("CMg", "CVMe", "CMe")}
+        y = Polynomial([0.0, 1.0])
+        p = self.potencia
+        for i in range(self.m):
+            c2, c3, CF, kappa = self.c2[i], self.c3[i], self.CF[i], self.kappa[i]
+            d = Polynomial([-self.capacidad[i] if np.isfinite(self.capacidad[i]) else 0.0, 1.0])
+            d_p1 = d ** (p - 1)
+
+            extra_cmg = kappa * (2 * p * d_p1 + (p * (p - 1) * y * d ** (p - 2) if p > 1 else 0))
+            res["CMg"][i] = self._minimo(i, self._tramos(i, Polynomial([2 * c2, 6 * c3]), extra_cmg), "CMg")
+            res["CVMe"][i] = self._minimo(i, self._tramos(i, Polynomial([c2, 2 * c3]), kappa * p * d_p1), "CVMe")
+            res["CMe"][i] = self._minimo(i, self._tramos(i, Polynomial([-CF, 0.0, c2, 2 * c3]),
+                                                         kappa * p * y ** 2 * d_p1), "CMe")
+        return res
+
+    @classmethod
+    def desde_cvme(cls, CF, base, curvatura, y_min, **kw):
+        # CVMe = base + curvatura·(y − y_min)² por debajo de la capacidad
+        return cls(CF, base + curvatura * y_min ** 2, -2 * curvatura * y_min, curvatura, **kw)
@@ -0,0 +1,120 @@
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import streamlit as st
+from matplotlib.lines import Line2D
+
+from modelos.figuras import familia_lineas
+
+# Escenarios con nombre para comparar varios juegos de parámetros en la misma
+# gráfica. Los parámetros de todos los escenarios se apilan como columnas
+# (m, 1) y la función de la página se evalúa una sola vez: cada curva sale
+# como un arreglo escenarios × malla.
+
+MAX_ESCENARIOS = 30
+ACTUAL = "(actual)"
+
+
+def _guardar(pagina, actuales):
+    guardados = st.session_state[f"escenarios_{pagina}"]
+    nombre = st.session_state[f"esc_nombre_{pagina}"].strip()
+    if not nombre or nombre == ACTUAL:
+        st.session_state[f"_esc_error_{pagina}"] = "Escribe un nombre para el escenario."
+        return
+    if nombre not in guardados and len(guardados) >= MAX_ESCENARIOS:
+        st.session_state[f"_esc_error_{pagina}"] = f"Máximo {MAX_ESCENARIOS} escenarios; borra alguno primero."
+        return
+
+    guardados[nombre] = dict(actuales)
+    elegidos = st.session_state.get(f"esc_elegidos_{pagina}", [])
+    if nombre not in elegidos:
+        st.session_state[f"esc_elegidos_{pagina}"] = elegidos + [nombre]
+    st.session_state[f"esc_nombre_{pagina}"] = f"Escenario {len(guardados) + 1}"
+
+
+def _borrar_no_elegidos(pagina):
+    guardados = st.session_state[f"escenarios_{pagina}"]
+    for n in set(guardados) - set(st.session_state.get(f"esc_elegidos_{pagina}", [])):
+        del guardados[n]
+
+
+def seccion_escenarios(pagina, actuales):
+    # Regresa {nombre: parámetros} de los escenarios a superponer, con los
+    # valores actuales de la barra lateral al inicio.
+    guardados = st.session_state.setdefault(f"escenarios_{pagina}", {})
+    st.session_state.setdefault(f"esc_nombre_{pagina}", "Escenario 1")
+
+    with st.sidebar.expander("Escenarios"):
+        st.text_input("Nombre del escenario", key=f"esc_nombre_{pagina}")
+        # Los botones actúan en callbacks: así el escenario nuevo ya aparece
+        # seleccionado en esta misma ejecución
+        st.button("Guardar parámetros actuales", key=f"esc_guardar_{pagina}",
+                  on_click=_guardar, args=(pagina, actuales))
+        error = st.session_state.pop(f"_esc_error_{pagina}", None)
+        if error:
+            st.error(error)
+
+        elegidos = st.multiselect("Superponer", list(guardados), key=f"esc_elegidos_{pagina}")
+        if guardados:
+            st.button("Borrar los no seleccionados", key=f"esc_borrar_{pagina}",
+                      on_click=_borrar_no_elegidos, args=(pagina,))
+
+    if not elegidos:
+        return {}
+    return {ACTUAL: dict(actuales), **{n: guardados[n] for n in elegidos}}
+
+
+def apilar(escenarios):
+    # {nombre: {param: valor}} -> {param: arreglo (m, 1)}
+    nombres = list(escenarios)
+    return {p: np.array([[float(escenarios[n][p])] for n in nombres]) for p in escenarios[nombres[0]]}
+
+
+def _colores(m):
+    cmap = plt.get_cmap("tab10" if m <= 10 else "tab20")
+    return [cmap(i % cmap.N) for i in range(m)]
+
+
+def figura_superpuesta(L, curvas, nombres):
+    # Una colección de líneas por panel en vez de una línea por escenario
+    colores = _colores(len(nombres))
+    fig, axes = plt.subplots(2, 2, figsize=(12, 7.5), constrained_layout=True)
+    for ax, (titulo, Y) in zip(axes.flat, curvas.items()):
+        familia_lineas(ax, L, Y, colors=colores, linewidths=2.0)
+        ax.set_title(titulo)
+        ax.set_xlabel("Trabajo (L)")
+        ax.grid(True)
+    for ax in axes.flat[len(curvas):]:
+        ax.set_visible(False)
+
+    marcas = [Line2D([], [], color=c, linewidth=2.0) for c in colores]
+    fig.legend(marcas, nombres, loc="outside right upper")
+    return fig
+
+
+def tabla_comparativa(nombres, L, CM, G, extras=None):
+    filas = np.arange(len(nombres))
+    i_cm = np.nanargmin(CM, axis=1)
+    i_g = np.nanargmax(G, axis=1)
+    tabla = pd.DataFrame({
+        "Escenario": nombres,
+        "CM mínimo": CM[filas, i_cm],
+        "L en CM mínimo": L[filas, i_cm],
+        "Ganancia máxima": G[filas, i_g],
+        "L en ganancia máxima": L[filas, i_g],
+    })
+    for columna, valores in (extras or {}).items():
+        tabla[columna] = valores
+    return tabla.set_index("Escenario")
+
+
+def seccion_comparacion(escenarios, L, curvas, tabla):
+    st.subheader("Comparación de escenarios")
+    st.caption(f"{len(escenarios)} escenarios evaluados juntos como un arreglo escenarios × malla.")
+    fig = figura_superpuesta(L, curvas, list(escenarios))
+    st.pyplot(fig)
+    plt.close(fig)
+
+    st.dataframe(tabla.round(3), width="stretch")
+    with st.expander("Parámetros de cada escenario"):
+        st.dataframe(pd.DataFrame.from_dict(escenarios, orient="index"), width="stretch")
@@ -0,0 +1,234 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, ThreadPoolExecutor, TimeoutError
+
+import numpy as np
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from modelos import atlas
+from modelos.cache import CacheResultados
+from modelos.render import INTERVALO, ColaLlena, interrupcion
+
+# Precálculo especulativo de valores vecinos. Los number_input avanzan de a un
+# paso, así que tras un cambio el siguiente clic casi siempre es ±1 paso del
+# mismo insumo. Esos vecinos se calculan en hilos de fondo y quedan en una
+# caché compartida; si el usuario cambia de insumo o de dirección, lo que aún
+# no empezó se cancela, salvo que otra sesión también lo esté esperando.
+#
+# Antes de empezar, cada tarea aparta del presupuesto lo que tardó la última
+# vez esa misma función (en primer plano o especulando); al terminar se
+# corrige con lo que tardó de verdad.
+
+HILOS = int(os.environ.get("ESPECULACION_HILOS", 2))
+# Segundos de cómputo especulativo permitidos por ventana (todas las sesiones)
+PRESUPUESTO = float(os.environ.get("ESPECULACION_PRESUPUESTO", 2.0))
+VENTANA = float(os.environ.get("ESPECULACION_VENTANA", 10.0))
+MAX_ENTRADAS = int(os.environ.get("ESPECULACION_MAX_ENTRADAS", 256))
+
+log = logging.getLogger(__name__)
+
+
+def _clave(nombre, params):
+    # Redondeo para que 0.5 + 0.05 y 0.55 caigan en la misma entrada
+    return (nombre,) + tuple(
+        (n, round(v, 9) if isinstance(v, float) else v) for n, v in sorted(params.items())
+    )
+
+
+def _congelar(valor):
+    # Los resultados se comparten entre sesiones: nadie debe modificarlos
+    if isinstance(valor, np.ndarray):
+        valor.flags.writeable = False
+    elif isinstance(valor, (tuple, list)):
+        for v in valor:
+            _congelar(v)
+    return valor
+
+
+class Especulador:
+    def __init__(self, hilos=HILOS, presupuesto=PRESUPUESTO, ventana=VENTANA):
+        self.presupuesto = presupuesto
+        self.ventana = ventana
+        self.cache = CacheResultados(MAX_ENTRADAS)
+        self._pool = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="especulacion")
+        self._gastos = deque()
+        # Última duración de cada función, por nombre
+        self._duraciones = {}
+        self._en_curso = {}
+        # Sesiones que esperan cada tarea en curso
+        self._interesados = {}
+        self._lock = threading.Lock()
+
+    def _apartar(self, nombre):
+        # Reserva el costo estimado si cabe en el presupuesto; regresa la
+        # entrada de gasto para corregirla al terminar, o None si no cabe.
+        # Sin estimación todavía, se supone que se lleva todo el presupuesto.
+        ahora = time.monotonic()
+        with self._lock:
+            while self._gastos and self._gastos[0][0] < ahora - self.ventana:
+                self._gastos.popleft()
+            estimado = self._duraciones.get(nombre, self.presupuesto)
+            if sum(g for _, g in self._gastos) + estimado > self.presupuesto:
+                return None
+            gasto = [ahora, estimado]
+            self._gastos.append(gasto)
+            return gasto
+
+    def _medir(self, nombre, funcion, params):
+        t0 = time.perf_counter()
+        valor = _congelar(funcion(**params))
+        with self._lock:
+            self._duraciones[nombre] = time.perf_counter() - t0
+        return valor
+
+    def _de_atlas(self, clave):
+        valor = atlas.buscar(clave)
+        if valor is not None:
+            self.cache.guardar(clave, valor)
+        return valor
+
+    def _tarea(self, clave, funcion, params):
+        # Lo que ya está en el atlas no gasta presupuesto
+        if clave in self.cache or self._de_atlas(clave) is not None:
+            return None
+        gasto = self._apartar(clave[0])
+        if gasto is None:
+            return None
+        t0 = time.perf_counter()
+        try:
+            valor = self._medir(clave[0], funcion, params)
+        except ColaLlena:
+            # El pool de figuras está ocupado: se omite sin contarlo como falla
+            return None
+        finally:
+            with self._lock:
+                gasto[1] = time.perf_counter() - t0
+        self.cache.guardar(clave, valor)
+        return valor
+
+    def enviar(self, clave, funcion, params, sesion=None):
+        with self._lock:
+            fut = self._en_curso.get(clave)
+            nueva = fut is None or fut.done()
+            if nueva:
+                fut = self._pool.submit(self._tarea, clave, funcion, params)
+                self._en_curso[clave] = fut
+                self._interesados[fut] = set()
+            self._interesados[fut].add(sesion)
+        if nueva:
+            fut.add_done_callback(lambda f: self._terminar(clave, f))
+        return fut
+
+    def soltar(self, fut, sesion=None):
+        # La sesión ya no necesita la tarea; se cancela si nadie más la espera
+        with self._lock:
+            interesados = self._interesados.get(fut)
+            if interesados is None:
+                return
+            interesados.discard(sesion)
+            if interesados:
+                return
+        fut.cancel()
+
+    def _terminar(self, clave, fut):
+        with self._lock:
+            if self._en_curso.get(clave) is fut:
+                del self._en_curso[clave]
+            self._interesados.pop(fut, None)
+        if not fut.cancelled() and fut.exception() is not None:
+            log.warning("Falló un precálculo especulativo: %r", fut.exception())
+
+    def calcular(self, clave, funcion, params, interrumpir=None):
+        # Como en PoolRender.renderizar: si `interrumpir()` devuelve True
+        # mientras se espera, se deja de esperar y se lanza CancelledError (o
+        # la excepción de control de Streamlit, si es ella la que lo avisa)
+        valor = self.cache.obtener(clave)
+        if valor is None:
+            valor = self._de_atlas(clave)
+        if valor is not None:
+            return valor
+
+        # Si ya se está especulando justo este valor, se espera a ese cálculo
+        with self._lock:
+            fut = self._en_curso.get(clave)
+        if fut is not None and fut.running():
+            while True:
+                try:
+                    valor = fut.result(timeout=INTERVALO)
+                    break
+                except TimeoutError:
+                    if interrumpir is not None and interrumpir():
+                        raise CancelledError()
+                except Exception:
+                    valor = None
+                    break
+            if valor is not None:
+                return valor
+
+        valor = self._medir(clave[0], funcion, params)
+        self.cache.guardar(clave, valor)
+        return valor
+
+
+@st.cache_resource
+def obtener_especulador():
+    return Especulador()
+
+
+def _anticipar(esp, nombre, funcion, params, pasos, limites):
+    estado = st.session_state.setdefault(
+        f"_especulacion_{nombre}", {"previos": None, "direccion": None, "pendientes": []}
+    )
+    ctx = get_script_run_ctx(suppress_warning=True)
+    sesion = ctx.session_id if ctx is not None else None
+    previos, estado["previos"] = estado["previos"], dict(params)
+    if previos is None:
+        return
+
+    cambios = [n for n in pasos if params[n] != previos.get(n)]
+    if not cambios:
+        return
+
+    insumo = cambios[0]
+    signo = 1 if params[insumo] > previos[insumo] else -1
+    direccion = (insumo, signo)
+
+    # El usuario tomó otro camino: lo pendiente ya no le sirve (a otras sesiones quizá sí)
+    if estado["direccion"] != direccion:
+        for fut in estado["pendientes"]:
+            esp.soltar(fut, sesion)
+        estado["pendientes"] = []
+    estado["direccion"] = direccion
+    estado["pendientes"] = [f for f in estado["pendientes"] if not f.done()]
+
+    # Primero el vecino en la misma dirección, luego el opuesto
+    for s in (signo, -signo):
+        valor = params[insumo] + s * pasos[insumo]
+        lo, hi = (limites or {}).get(insumo, (None, None))
+        if (lo is not None and valor < lo) or (hi is not None and valor > hi):
+            continue
+        if isinstance(params[insumo], int):
+            valor = int(valor)
+        vecino = dict(params, **{insumo: valor})
+        estado["pendientes"].append(esp.enviar(_clave(nombre, vecino), funcion, vecino, sesion))
+
+
+def resultado(nombre, funcion, params, pasos, limites=None, activo=False):
+    # `funcion(**params)` debe ser pura: su valor se comparte entre sesiones.
+    # `pasos` indica el paso de cada insumo que se puede anticipar y
+    # `limites` sus (mínimo, máximo) para no salirse del rango del widget.
+    esp = obtener_especulador()
+    clave = _clave(nombre, params)
+    try:
+        valor = esp.calcular(clave, funcion, params, interrupcion())
+    except CancelledError:
+        # La sesión ya pidió otra ejecución
+        st.stop()
+    atlas.registrar(clave, valor)
+    if activo:
+        _anticipar(esp, nombre, funcion, params, pasos, limites)
+    return valor
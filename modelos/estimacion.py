@@ -0,0 +1,63 @@
+import numpy as np
+
+# Mínimos cuadrados de log Q = log A + a·log K + b·log L acumulando solo las
+# estadísticas suficientes (X'X, X'y, y'y). La memoria no depende del número
+# de filas: cada bloque del archivo se suma y se descarta.
+
+
+class MCOIncremental:
+    def __init__(self):
+        self.XtX = np.zeros((3, 3))
+        self.Xty = np.zeros(3)
+        self.yty = 0.0
+        self.n = 0
+        self.descartadas = 0
+
+    def agregar(self, K, L, Q):
+        K = np.asarray(K, dtype=float)
+        L = np.asarray(L, dtype=float)
+        Q = np.asarray(Q, dtype=float)
+
+        # El logaritmo solo existe para valores positivos
+        validas = (K > 0) & (L > 0) & (Q > 0)
+        self.descartadas += int(validas.size - validas.sum())
+
+        X = np.column_stack([
+            np.ones(int(validas.sum())),
+            np.log(K[validas]),
+            np.log(L[validas]),
+        ])
+        y = np.log(Q[validas])
+
+        self.XtX += X.T @ X
+        self.Xty += X.T @ y
+        self.yty += float(y @ y)
+        self.n += len(y)
+
+    def ajustar(self):
+        if self.n <= 3:
+            raise ValueError("Se necesitan al menos 4 observaciones válidas (K, L, Q > 0).")
+
+        beta = np.linalg.solve(self.XtX, self.Xty)
+        sce = max(self.yty - beta @ self.Xty, 0.0)
+        gl = self.n - 3
+        cov = sce / gl * np.linalg.inv(self.XtX)
+        ee = np.sqrt(np.diag(cov))
+
+        stc = self.yty - self.Xty[0] ** 2 / self.n
+        r2 = 1 - sce / stc if stc > 0 else float("nan")
+
+        logA, a, b = beta
+        return {
+            "A": float(np.exp(logA)),
+            "a": float(a),
+            "b": float(b),
+            "ee_logA": float(ee[0]),
+            "ee_a": float(ee[1]),
+            "ee_b": float(ee[2]),
+            # Var(a + b) = Var(a) + Var(b) + 2·Cov(a, b)
+            "ee_suma": float(np.sqrt(cov[1, 1] + cov[2, 2] + 2 * cov[1, 2])),
+            "r2": float(r2),
+            "n": self.n,
+            "descartadas": self.descartadas,
+        }
@@ -0,0 +1,70 @@
+import io
+
+import numpy as np
+import streamlit as st
+
+# Exportación binaria de las columnas calculadas directamente desde sus
+# buffers de NumPy (sin pasar por DataFrame ni por texto). Cada columna
+# conserva su dtype.
+#
+#   .npz (comprimido):  leer_npz(ruta)["Q"]
+#   Arrow IPC:          leer_arrow(ruta) abre el archivo con memory mapping,
+#                       las columnas apuntan al archivo sin copiarse.
+#
+# herramientas/verificar_exportar.py hace la ida y vuelta con ambos formatos.
+
+FORMATOS = {
+    "NumPy .npz (comprimido)": ("npz", "application/octet-stream"),
+    "Arrow IPC (.arrow, memory-mapped)": ("arrow", "application/vnd.apache.arrow.file"),
+}
+
+
+def a_npz(columnas):
+    buf = io.BytesIO()
+    np.savez_compressed(buf, **{n: np.asarray(v) for n, v in columnas.items()})
+    return buf.getvalue()
+
+
+def a_arrow(columnas):
+    # pyarrow viene con streamlit; se importa aquí para no cargarlo si no se exporta
+    import pyarrow as pa
+
+    # pa.array sobre un arreglo numérico contiguo no copia los datos
+    tabla = pa.table({n: pa.array(np.ascontiguousarray(v)) for n, v in columnas.items()})
+    sink = pa.BufferOutputStream()
+    # Sin compresión para que el archivo pueda leerse con memory mapping
+    with pa.ipc.new_file(sink, tabla.schema) as escritor:
+        escritor.write_table(tabla)
+    return sink.getvalue().to_pybytes()
+
+
+def leer_npz(ruta):
+    # Carga perezosa: cada columna se descomprime al pedirla
+    return np.load(ruta)
+
+
+def leer_arrow(ruta):
+    import pyarrow as pa
+
+    return pa.ipc.open_file(pa.memory_map(ruta, "r")).read_all()
+
+
+def seccion_exportar(columnas, nombre_base):
+    with st.expander("Exportar resultados (binario)"):
+        st.caption(
+            "Columnas: " + ", ".join(columnas) + ". "
+            "Se escriben desde los arreglos originales, sin redondeo."
+        )
+        formato = st.radio("Formato", list(FORMATOS), horizontal=True, key=f"fmt_{nombre_base}")
+        # Se genera solo cuando se pide, no en cada ejecución de la página
+        if not st.checkbox("Preparar archivo", key=f"prep_{nombre_base}"):
+            return
+
+        ext, mime = FORMATOS[formato]
+        datos = a_npz(columnas) if ext == "npz" else a_arrow(columnas)
+        st.download_button(
+            f"Descargar {nombre_base}.{ext} ({len(datos) / 1024:.0f} KB)",
+            data=datos,
+            file_name=f"{nombre_base}.{ext}",
+            mime=mime,
+        )
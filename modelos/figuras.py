@@ -0,0 +1,129 @@
+import matplotlib
+import matplotlib.style
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+
+# Figuras que se dibujan fuera del hilo de la sesión (ver modelos/render.py).
+# Cada función recibe un diccionario de arreglos y parámetros simples, y
+# regresa una Figure sin pasar por el estado global de pyplot.
+
+ESTILO_CMLP = {
+    "figure.dpi": 140,
+    "font.size": 11,
+    "axes.titlesize": 14,
+    "axes.labelsize": 12,
+    "axes.edgecolor": "#2b2b2b",
+    "axes.linewidth": 1.0,
+    "grid.alpha": 0.25,
+    "grid.linestyle": "-",
+    "legend.frameon": False,
+}
+
+
+def familia_lineas(ax, x, Y, **kw):
+    # Una familia de curvas (una por fila de Y) como un solo artista. Con
+    # cientos de curvas cuesta casi lo mismo dibujarla que con cinco.
+    Y = np.atleast_2d(Y)
+    x = np.broadcast_to(x, Y.shape)
+    col = LineCollection(np.stack([x, Y], axis=-1), **kw)
+    ax.add_collection(col)
+    ax.autoscale_view()
+    return col
+
+
+def superficie_cobb(arrays, titulo="Superficie 3D – Función Cobb-Douglas", zlabel="Q"):
+    # K y L llegan como ejes 1-D; se amplían por broadcasting sin copiar.
+    K = arrays["K"][np.newaxis, :]
+    L = arrays["L"][:, np.newaxis]
+    Q = arrays["Q"]
+
+    with matplotlib.style.context("seaborn-v0_8"):
+        fig = Figure(figsize=(8, 6))
+        ax = fig.add_subplot(111, projection="3d")
+        ax.plot_surface(K, L, Q, cmap="viridis", edgecolor="none")
+        ax.set_title(titulo)
+        ax.set_xlabel("K")
+        ax.set_ylabel("L")
+        ax.set_zlabel(zlabel)
+    return fig
+
+
+def cmlp_envolvente(arrays, Qmax, tps, precios, show_prices=True, show_tps=True,
+                    show_minima=True, highlight_envelope=True, n_destacadas=None):
+    q = arrays["q"]
+    CM_todas = arrays["CM"]
+    CMLP = arrays["CMLP"]
+
+    # Las primeras `n_destacadas` filas son las técnicas con nombre; el resto
+    # es una familia que se dibuja como una sola colección de líneas.
+    n_destacadas = len(CM_todas) if n_destacadas is None else n_destacadas
+    CM, familia = CM_todas[:n_destacadas], CM_todas[n_destacadas:]
+
+    # Mínimos "dentro del rango" (en esta forma funcional a/q + b, el mínimo ocurre al máximo q)
+    # Pero marcamos el mínimo numérico en el rango por robustez.
+    idx_min = np.argmin(CM, axis=1)
+    q_min = q[idx_min]
+    cm_min = CM[np.arange(len(CM)), idx_min]
+
+    # Límites de y (robustos)
+    y_min = min(CM_todas.min(), CMLP.min()) * 0.92
+    y_max = max(CM_todas.max(), CMLP.max()) * 1.08
+    if not np.isfinite(y_min) or not np.isfinite(y_max) or y_min == y_max:
+        y_min, y_max = 0, 1
+
+    with matplotlib.rc_context(ESTILO_CMLP):
+        fig = Figure(figsize=(11, 6), constrained_layout=True)
+        ax = fig.add_subplot(111)
+
+        if len(familia):
+            familia_lineas(ax, q, familia, linewidths=0.8, colors="0.55", alpha=0.35,
+                           label=f"Técnicas intermedias ({len(familia)})")
+
+        # Curvas SRAC (costo medio de corto plazo)
+        for i, cm in enumerate(CM, start=1):
+            ax.plot(q, cm, linewidth=2.5, label=f"CM{i} (técnica {i})")
+
+        # Envolvente (CMLP)
+        if highlight_envelope:
+            ax.plot(q, CMLP, linewidth=4.0, label="CMLP (envolvente)")
+            # Sombreado muy sutil para enfatizar
+            ax.fill_between(q, CMLP, y_max, alpha=0.06)
+
+        # Líneas verticales TP
+        if show_tps:
+            for i, tp in enumerate(tps, start=1):
+                if 0 <= tp <= Qmax:
+                    ax.axvline(tp, linestyle="--", linewidth=1.4)
+                    ax.text(tp, y_min + (y_max - y_min) * 0.02, f"TP{i}", rotation=90,
+                            va="bottom", ha="right")
+
+        # Líneas horizontales de precio (segmentos)
+        if show_prices:
+            for i, (p, tp) in enumerate(zip(precios, tps), start=1):
+                if 0 <= tp <= Qmax:
+                    x0 = max(0, tp - 10)
+                    x1 = min(Qmax, tp + 10)
+                    ax.hlines(p, x0, x1, linewidth=3.0)
+                    ax.text(tp, p, f" P{i}", va="bottom", ha="left")
+
+        # Marcadores de mínimos
+        if show_minima:
+            ax.scatter(q_min, cm_min, s=55, zorder=5)
+            for i, (qm, cmm) in enumerate(zip(q_min, cm_min), start=1):
+                ax.annotate(f"min CM{i} ≈ ({qm:.1f}, {cmm:.1f})", (qm, cmm),
+                            textcoords="offset points",
+                            xytext=(10, -15 if i % 2 == 0 else 10), ha="left")
+
+        # Ejes, título, grid
+        ax.set_title("Costo Medio de Largo Plazo (CMLP) como envolvente de técnicas")
+        ax.set_xlabel("Cantidad (q)")
+        ax.set_ylabel("Costo medio / Precio")
+
+        ax.set_xlim(0, Qmax)
+        ax.set_ylim(y_min, y_max)
+        ax.grid(True)
+
+        # Leyenda
+        ax.legend(loc="upper right")
+    return fig
@@ -0,0 +1,81 @@
+import inspect
+import os
+
+import numpy as np
+
+from modelos.cache import CacheResultados
+
+# Grafo de dependencias entre cantidades derivadas. Cada nodo es una función
+# cuyos parámetros son los nombres de las entradas o de otros nodos de los que
+# depende; su valor se guarda con la clave de las entradas de las que depende
+# (directa o indirectamente). Si en un rerun solo cambió P, Q conserva su
+# clave y sale de la caché: solo se evalúan los nodos aguas abajo de P.
+#
+#   g = Grafo(("L_max", "w"))
+#
+#   @g.nodo
+#   def L(L_max): ...
+#
+#   @g.nodo
+#   def CT(w, L): ...
+#
+#   L_vals, CT_vals = g.evaluar(dict(L_max=50.0, w=100.0), ("L", "CT"))
+#
+# La evaluación es perezosa: solo se calculan los nodos pedidos y los que
+# hagan falta para ellos. La caché es del proceso y se comparte entre
+# sesiones, así que los nodos deben ser funciones puras.
+
+MAX_ENTRADAS = int(os.environ.get("FLUJO_MAX_ENTRADAS", 256))
+
+
+def _clave_valor(valor):
+    # Las entradas de los escenarios son columnas (m, 1): se comparan por contenido
+    if isinstance(valor, np.ndarray):
+        return (valor.shape, valor.dtype.str, valor.tobytes())
+    if isinstance(valor, float):
+        return round(valor, 9)
+    return valor
+
+
+class Grafo:
+    def __init__(self, entradas, max_entradas=MAX_ENTRADAS):
+        self.entradas = tuple(entradas)
+        self._nodos = {}
+        self._cache = CacheResultados(max_entradas)
+
+    def nodo(self, funcion):
+        # Un nodo solo puede depender de entradas o de nodos ya declarados,
+        # así que no puede haber ciclos
+        nombre = funcion.__name__
+        deps = tuple(inspect.signature(funcion).parameters)
+        desconocidas = [d for d in deps if d not in self.entradas and d not in self._nodos]
+        if desconocidas:
+            raise ValueError(f"El nodo {nombre} depende de {desconocidas}, que no están declarados")
+        raices = set()
+        for d in deps:
+            raices |= {d} if d in self.entradas else set(self._nodos[d][2])
+        self._nodos[nombre] = (funcion, deps, tuple(e for e in self.entradas if e in raices))
+        return funcion
+
+    def evaluar(self, valores, salidas):
+        faltan = [e for e in self.entradas if e not in valores]
+        if faltan:
+            raise KeyError(f"Faltan entradas: {faltan}")
+        calculados = {e: valores[e] for e in self.entradas}
+
+        def valor(nombre):
+            if nombre in calculados:
+                return calculados[nombre]
+            funcion, deps, raices = self._nodos[nombre]
+            clave = (nombre,) + tuple(_clave_valor(valores[e]) for e in raices)
+            v = self._cache.obtener(clave)
+            if v is None:
+                v = funcion(*(valor(d) for d in deps))
+                if isinstance(v, np.ndarray):
+                    # Se comparte entre sesiones: nadie debe modificarlo
+                    v.flags.writeable = False
+                self._cache.guardar(clave, v)
+            calculados[nombre] = v
+            return v
+
+        return tuple(valor(n) for n in salidas)
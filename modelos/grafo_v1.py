@@ -0,0 +1,45 @@
+import numpy as np
+
+from modelos.acelerado import produccion_cobb
+from modelos.flujo import Grafo
+from modelos.rendimientos import EPS
+
+# Cantidades de la página v1 como grafo de modelos/flujo.py: si solo cambia
+# P se recalculan IT y G; si cambia w, CT, CM y G, pero no Q. Los nodos
+# funcionan con parámetros escalares (curvas 1-D) o con columnas (m, 1) de
+# escenarios (curvas m × malla).
+
+N = 300
+SALIDAS = ("L", "Q", "CT", "CM", "IT", "G")
+
+grafo = Grafo(("x", "K", "L_max", "l", "k", "w", "P"))
+
+
+@grafo.nodo
+def L(L_max):
+    return 1 + (L_max - 1) * np.linspace(0, 1, N)
+
+
+@grafo.nodo
+def Q(x, L, K, l, k):
+    return produccion_cobb(x, K, L, k, l)
+
+
+@grafo.nodo
+def CT(w, L):
+    return w * L
+
+
+@grafo.nodo
+def CM(CT, Q):
+    return CT / np.maximum(Q, EPS)
+
+
+@grafo.nodo
+def IT(P, Q):
+    return P * Q
+
+
+@grafo.nodo
+def G(IT, CT):
+    return IT - CT
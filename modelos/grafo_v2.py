@@ -0,0 +1,65 @@
+import numpy as np
+
+from modelos.acelerado import produccion_cobb
+from modelos.flujo import Grafo
+from modelos.rendimientos import EPS
+
+# Cantidades de la página v2 como grafo de modelos/flujo.py (ver
+# modelos/grafo_v1.py): cada curva de producción es su propio nodo, así que
+# cambiar l_crec no recalcula Q_decr ni Q_exp.
+
+N = 200
+SALIDAS = ("L", "Q_decr", "Q_crec", "Q_exp", "CT", "CM", "IT", "G", "PM_L", "CMg")
+
+grafo = Grafo(("x", "L_max", "K", "l_crec", "l_decr", "k", "beta", "w", "precio"))
+
+
+@grafo.nodo
+def L(L_max):
+    return 1 + (L_max - 1) * np.linspace(0, 1, N)
+
+
+@grafo.nodo
+def Q_decr(x, L, K, l_decr, k):
+    return produccion_cobb(x, K, L, k, l_decr)
+
+
+@grafo.nodo
+def Q_crec(x, L, K, l_crec, k):
+    return produccion_cobb(x, K, L, k, l_crec)
+
+
+@grafo.nodo
+def Q_exp(x, L, K, beta):
+    return x * np.exp(beta * L) * K
+
+
+@grafo.nodo
+def CT(w, L):
+    return w * L
+
+
+@grafo.nodo
+def CM(CT, Q_crec):
+    return np.divide(CT, Q_crec, out=np.zeros_like(CT, dtype=float), where=Q_crec != 0)
+
+
+@grafo.nodo
+def IT(Q_crec, precio):
+    return Q_crec * precio
+
+
+@grafo.nodo
+def G(IT, CT):
+    return IT - CT
+
+
+@grafo.nodo
+def PM_L(x, l_crec, L, K, k):
+    return x * l_crec * (L ** (l_crec - 1)) * (K ** k)
+
+
+@grafo.nodo
+def CMg(w, PM_L):
+    PM_L_safe = np.maximum(PM_L, EPS)
+    return np.divide(w, PM_L_safe, out=np.zeros_like(PM_L_safe), where=PM_L_safe != 0)
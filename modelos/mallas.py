@@ -0,0 +1,51 @@
+import numpy as np
+import streamlit as st
+
+from modelos.cobb import produccion_cobb
+
+# Malla compartida de la función de producción. Se evalúa una sola vez, a la
+# mayor resolución que pide cualquier gráfica, y cada consumidor toma una vista
+# (superficie, isocuantas, cortes en L y en K) sin copiar datos.
+
+RESOLUCION = 100      # cortes 1-D Q(L) y Q(K)
+PASO_SUPERFICIE = 3   # ~34×34 puntos para plot_surface
+PASO_CONTORNO = 2     # ~51×51 puntos para las isocuantas
+
+
+def _eje(x, n):
+    # linspace(1, 3x, n) más el propio x, para que los cortes en el valor
+    # actual del insumo sean filas/columnas exactas de la malla
+    eje = np.union1d(np.linspace(1, x * 3, n), [x])
+    return eje, int(np.searchsorted(eje, x))
+
+
+class MallaCobb:
+    def __init__(self, A, a, b, K, L, n=RESOLUCION):
+        self.K, self.iK = _eje(K, n)
+        self.L, self.iL = _eje(L, n)
+
+        # Filas = L, columnas = K (el mismo orden que meshgrid(K, L))
+        self.Q = produccion_cobb(A, self.K[np.newaxis, :], self.L[:, np.newaxis], a, b)
+
+        # Se comparte entre sesiones: nadie debe modificarla
+        for arr in (self.K, self.L, self.Q):
+            arr.flags.writeable = False
+
+    def superficie(self, paso=PASO_SUPERFICIE):
+        return self.K[::paso], self.L[::paso], self.Q[::paso, ::paso]
+
+    def contorno(self, paso=PASO_CONTORNO):
+        return self.K[::paso], self.L[::paso], self.Q[::paso, ::paso]
+
+    def corte_L(self):
+        # Q(L) con K fijo en su valor actual
+        return self.L, self.Q[:, self.iK]
+
+    def corte_K(self):
+        # Q(K) con L fijo en su valor actual
+        return self.K, self.Q[self.iL, :]
+
+
+@st.cache_resource(max_entries=64)
+def obtener_malla(A, a, b, K, L):
+    return MallaCobb(A, a, b, K, L)
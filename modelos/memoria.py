@@ -0,0 +1,270 @@
+import csv
+import gc
+import os
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Memoria de una sola ejecución de la página: con PERFIL_ADMIN=1 se pide con
+# ?perfil=memoria o con el botón de la barra lateral, y la página se vuelve a
+# ejecutar como en modelos/perfil.py, esta vez bajo tracemalloc. Se reportan
+# el pico y lo retenido al terminar, los sitios del código que retienen más,
+# las figuras de Matplotlib que quedaron abiertas, los búferes grandes de NumPy
+# y los arreglos y tablas grandes del espacio de nombres de la página y de
+# session_state. tracemalloc ve todos los hilos: si otras sesiones están
+# activas, sus asignaciones también cuentan.
+#
+# Cada medición guarda un .tracemalloc (para comparar dos ejecuciones con
+# python -m herramientas.diferencia_memoria a.tracemalloc b.tracemalloc) y
+# agrega una fila a memoria.csv, para fijar presupuestos con datos reales.
+#
+# tracemalloc y su pico son de todo el proceso: si dos sesiones miden a la vez,
+# el rastreo sigue activo hasta que termina la última, y ninguna de las dos
+# reporta pico, retenido ni sitios (incluirían lo que asignó la otra).
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Marcos guardados por asignación: con menos, la medición es más rápida (en v1,
+# ~6 s con 8 contra ~20 s con 25) pero lo que asigna Matplotlib ya no llega a
+# la línea de la página que lo pidió
+MARCOS = int(os.environ.get("MEMORIA_MARCOS", 25))
+# Tamaño a partir del cual un búfer o una tabla cuenta como grande
+UMBRAL_MB = float(os.environ.get("MEMORIA_UMBRAL_MB", 1.0))
+TOP_N = 25
+
+_PROPIOS = (os.path.join(RAIZ, "modelos", "memoria.py"), os.path.join(RAIZ, "modelos", "perfil.py"))
+# Última medición de cada página en este proceso, para ver el crecimiento
+_anteriores = {}
+
+_lock = threading.Lock()
+# Mediciones en curso, total de mediciones iniciadas y si el rastreo lo
+# arrancó este módulo
+_en_curso = 0
+_iniciadas = 0
+_propio = False
+
+
+def _empezar():
+    # Regresa el número de medición y si es la única en curso
+    global _en_curso, _iniciadas, _propio
+    with _lock:
+        if _en_curso == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(MARCOS)
+            _propio = True
+        _en_curso += 1
+        _iniciadas += 1
+        sola = _en_curso == 1
+        if sola:
+            tracemalloc.reset_peak()
+        return _iniciadas, sola
+
+
+def _terminar(numero):
+    # Regresa True si ninguna otra medición se cruzó con esta; el rastreo
+    # solo se apaga al terminar la última
+    global _en_curso, _propio
+    with _lock:
+        sola = _en_curso == 1 and _iniciadas == numero
+        _en_curso -= 1
+        if _en_curso == 0 and _propio:
+            tracemalloc.stop()
+            _propio = False
+        return sola
+
+
+def _sitio(traceback):
+    # El marco más reciente que está en el código del repositorio; si no
+    # hay ninguno, el más reciente a secas
+    for marco in reversed(traceback):
+        if marco.filename.startswith(RAIZ) and marco.filename not in _PROPIOS:
+            return f"{os.path.relpath(marco.filename, RAIZ)}:{marco.lineno}"
+    marco = traceback[-1]
+    return f"{os.path.basename(marco.filename)}:{marco.lineno}"
+
+
+def por_sitio(snapshot):
+    tamanos, bloques = Counter(), Counter()
+    for s in snapshot.statistics("traceback"):
+        sitio = _sitio(s.traceback)
+        tamanos[sitio] += s.size
+        bloques[sitio] += s.count
+    return tamanos, bloques
+
+
+def diferencia(despues, antes, n=TOP_N):
+    # Sitios que más crecieron entre dos snapshots
+    t1, b1 = por_sitio(despues)
+    t0, b0 = por_sitio(antes)
+    filas = [{"Sitio": s, "Crecimiento (KB)": (t1[s] - t0[s]) / 1024,
+              "Total (KB)": t1[s] / 1024, "Bloques nuevos": b1[s] - b0[s]}
+             for s in set(t1) | set(t0) if t1[s] != t0[s]]
+    tabla = pd.DataFrame(filas, columns=["Sitio", "Crecimiento (KB)", "Total (KB)", "Bloques nuevos"])
+    return tabla.sort_values("Crecimiento (KB)", ascending=False).head(n).reset_index(drop=True)
+
+
+def _buferes_numpy(snapshot):
+    # Los datos de los arreglos de NumPy se registran en su propio dominio
+    umbral = UMBRAL_MB * 1024 ** 2
+    trazas = snapshot.filter_traces([tracemalloc.DomainFilter(True, np.lib.tracemalloc_domain)]).traces
+    grandes = sorted((t for t in trazas if t.size >= umbral), key=lambda t: t.size, reverse=True)
+    return pd.DataFrame(
+        [{"Tamaño (MB)": t.size / 1024 ** 2, "Sitio": _sitio(t.traceback)} for t in grandes],
+        columns=["Tamaño (MB)", "Sitio"],
+    )
+
+
+def _tamano(valor):
+    if isinstance(valor, np.ndarray):
+        return valor.nbytes
+    if isinstance(valor, pd.DataFrame):
+        return int(valor.memory_usage(deep=True).sum())
+    if isinstance(valor, (bytes, bytearray)):
+        return len(valor)
+    return 0
+
+
+def _recorrer(nombre, valor, profundidad=0):
+    # (nombre, valor) de los arreglos, tablas y PNG dentro de dicts, listas y tuplas
+    if _tamano(valor):
+        yield nombre, valor
+    elif profundidad < 4 and isinstance(valor, dict):
+        for k, v in valor.items():
+            yield from _recorrer(f"{nombre}[{k!r}]", v, profundidad + 1)
+    elif profundidad < 4 and isinstance(valor, (list, tuple)):
+        for i, v in enumerate(valor):
+            yield from _recorrer(f"{nombre}[{i}]", v, profundidad + 1)
+
+
+def objetos_grandes(espacios):
+    # `espacios` es {origen: dict}, p. ej. el de la página y session_state
+    umbral = UMBRAL_MB * 1024 ** 2
+    filas, vistos = [], set()
+    for origen, espacio in espacios.items():
+        for nombre, valor in espacio.items():
+            if nombre.startswith("__"):
+                continue
+            for ruta, v in _recorrer(nombre, valor):
+                if id(v) in vistos or _tamano(v) < umbral:
+                    continue
+                vistos.add(id(v))
+                forma = getattr(v, "shape", (len(v),))
+                filas.append({"Origen": origen, "Nombre": ruta, "Tipo": type(v).__name__,
+                              "Forma": "×".join(map(str, forma)), "Tamaño (MB)": _tamano(v) / 1024 ** 2})
+    tabla = pd.DataFrame(filas, columns=["Origen", "Nombre", "Tipo", "Forma", "Tamaño (MB)"])
+    return tabla.sort_values("Tamaño (MB)", ascending=False).reset_index(drop=True)
+
+
+def tamano_sesion(estado):
+    vistos = set()
+    total = 0
+    for nombre, valor in estado.items():
+        for _, v in _recorrer(nombre, valor):
+            if id(v) not in vistos:
+                vistos.add(id(v))
+                total += _tamano(v)
+    return total
+
+
+def medir(ejecutar, archivo, base):
+    # `ejecutar()` corre la página y regresa (espacio de nombres o None, detenida)
+    numero, sola = _empezar()
+    try:
+        gc.collect()
+        figuras_antes = set(plt.get_fignums())
+        antes = tracemalloc.take_snapshot()
+        inicial, _ = tracemalloc.get_traced_memory()
+        t0 = time.perf_counter()
+        try:
+            espacio, detenida = ejecutar()
+        finally:
+            duracion = time.perf_counter() - t0
+            _, pico = tracemalloc.get_traced_memory()
+            gc.collect()
+            despues = tracemalloc.take_snapshot()
+            final, _ = tracemalloc.get_traced_memory()
+    finally:
+        sola = _terminar(numero) and sola
+
+    # Tras st.stop ya no se puede leer session_state
+    estado = {} if detenida else st.session_state.to_dict()
+    figuras = set(plt.get_fignums())
+    res = {
+        "base": base,
+        "sola": sola,
+        "duracion": duracion,
+        "figuras_abiertas": len(figuras),
+        "figuras_nuevas": len(figuras - figuras_antes),
+        "buferes": _buferes_numpy(despues),
+        "sesion": tamano_sesion(estado),
+        "objetos": objetos_grandes({"página": espacio or {}, "sesión": estado}),
+    }
+    if not sola:
+        return res, detenida
+
+    despues.dump(base + ".tracemalloc")
+    anterior = _anteriores.get(archivo)
+    # La rotación de modelos/perfil.py pudo haberlo borrado
+    if anterior is not None and not os.path.exists(anterior):
+        anterior = None
+    _anteriores[archivo] = base + ".tracemalloc"
+    res.update({
+        "pico": pico - inicial,
+        "retenido": final - inicial,
+        "sitios": diferencia(despues, antes),
+        "crecimiento": diferencia(despues, tracemalloc.Snapshot.load(anterior)) if anterior else None,
+    })
+    _anotar(archivo, res, detenida)
+    return res, detenida
+
+
+def _anotar(archivo, res, detenida):
+    ruta = os.path.join(os.path.dirname(res["base"]), "memoria.csv")
+    nuevo = not os.path.exists(ruta)
+    with open(ruta, "a", newline="", encoding="utf-8") as f:
+        escritor = csv.writer(f)
+        if nuevo:
+            escritor.writerow(["fecha", "pagina", "duracion_s", "pico_mb", "retenido_mb", "figuras_abiertas",
+                               "figuras_nuevas", "buferes_grandes", "buferes_mb", "sesion_mb", "detenida"])
+        escritor.writerow([time.strftime("%Y-%m-%d %H:%M:%S"), os.path.basename(archivo),
+                           round(res["duracion"], 3), round(res["pico"] / 1024 ** 2, 2),
+                           round(res["retenido"] / 1024 ** 2, 2), res["figuras_abiertas"],
+                           res["figuras_nuevas"], len(res["buferes"]),
+                           round(res["buferes"]["Tamaño (MB)"].sum(), 2),
+                           round(res["sesion"] / 1024 ** 2, 2), detenida])
+
+
+def mostrar(res):
+    if not res["sola"]:
+        st.warning("Otra sesión midió memoria al mismo tiempo: el pico, lo retenido y los sitios "
+                   "incluirían sus asignaciones y no se reportan. Vuelve a medir en un momento.")
+    c1, c2, c3, c4 = st.columns(4)
+    if res["sola"]:
+        c1.metric("Pico durante la ejecución", f"{res['pico'] / 1024 ** 2:.1f} MB")
+        c2.metric("Retenido al terminar", f"{res['retenido'] / 1024 ** 2:.1f} MB")
+    c3.metric("Figuras abiertas", res["figuras_abiertas"], f"{res['figuras_nuevas']} nuevas", delta_color="inverse")
+    c4.metric("Arreglos, tablas y PNG en la sesión", f"{res['sesion'] / 1024 ** 2:.1f} MB")
+
+    if res["sola"]:
+        st.markdown("**Sitios que retienen más memoria**")
+        st.dataframe(res["sitios"].round(1), hide_index=True, width="stretch")
+
+    if res.get("crecimiento") is not None:
+        st.markdown("**Crecimiento desde la medición anterior de esta página**")
+        st.dataframe(res["crecimiento"].round(1), hide_index=True, width="stretch")
+
+    st.markdown(f"**Búferes de NumPy vivos de {UMBRAL_MB:g} MB o más** ({len(res['buferes'])})")
+    st.dataframe(res["buferes"].round(2), hide_index=True, width="stretch")
+    st.markdown("**Arreglos y tablas grandes en la página y en session_state**")
+    st.dataframe(res["objetos"].round(2), hide_index=True, width="stretch")
+
+    if not res["sola"]:
+        return
+    st.caption(f"Snapshot: {res['base']}.tracemalloc · Registro: {os.path.dirname(res['base'])}/memoria.csv")
+    with open(res["base"] + ".tracemalloc", "rb") as f:
+        st.download_button("Descargar snapshot", f.read(), file_name=os.path.basename(res["base"]) + ".tracemalloc",
+                           on_click="ignore")
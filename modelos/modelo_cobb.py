@@ -0,0 +1,96 @@
+import matplotlib.pyplot as plt
+import streamlit as st
+
+from modelos import atlas
+from modelos.mallas import obtener_malla
+from modelos.render import figura_a_png
+
+# Parámetros Cobb-Douglas de la sesión, compartidos por las páginas 1, 2 y 3
+# (y escritos por la estimación con datos). Cada página tiene sus propios
+# widgets, pero al entrar se inicializan con los valores guardados aquí y
+# cada cambio se escribe de vuelta. Junto a los parámetros se guardan los
+# resultados ya calculados (arreglos, PNG), cada uno con las entradas que lo
+# produjeron: mientras no cambien, cambiar de página no recalcula nada.
+
+PARAMETROS = {"A": 1.0, "a": 0.5, "b": 0.5, "K": 10.0, "L": 5.0}
+
+
+def _almacen():
+    return st.session_state.setdefault(
+        "modelo_cobb", {"params": dict(PARAMETROS), "estimado": False, "memo": {}}
+    )
+
+
+def parametros():
+    return dict(_almacen()["params"])
+
+
+def actualizar(estimado=False, **valores):
+    alm = _almacen()
+    alm["params"].update({n: float(v) for n, v in valores.items()})
+    alm["estimado"] = estimado
+
+
+def estimado():
+    # Los valores vienen de la página de estimación y nadie los ha tocado
+    return _almacen()["estimado"]
+
+
+def _escribir(nombre, clave):
+    actualizar(**{nombre: st.session_state[clave]})
+
+
+def entrada(nombre, etiqueta, pagina, min_value=0.0, **kw):
+    # La clave es propia de cada página porque los mínimos no coinciden; al
+    # salir de la página Streamlit borra su estado y al volver se toma el
+    # valor guardado (recortado al mínimo de este widget).
+    clave = f"cobb_{nombre}_{pagina}"
+    if clave not in st.session_state:
+        st.session_state[clave] = max(_almacen()["params"][nombre], min_value)
+    return st.number_input(etiqueta, min_value=min_value, key=clave,
+                           on_change=_escribir, args=(nombre, clave), **kw)
+
+
+def memo(nombre, entradas, calcular):
+    # Un resultado por nombre; se recalcula solo si cambian sus entradas (y
+    # no está ya en el atlas de modelos/atlas.py)
+    guardado = _almacen()["memo"].get(nombre)
+    if guardado is not None and guardado[0] == entradas:
+        valor = guardado[1]
+    else:
+        valor = atlas.buscar((nombre, entradas))
+        if valor is None:
+            valor = calcular()
+        _almacen()["memo"][nombre] = (entradas, valor)
+    atlas.registrar((nombre, entradas), valor)
+    return valor
+
+
+def graficas_trabajo(A, a, b, K, L):
+    # Q(L), PMg_L y PMe_L con K fijo, como PNG. Gráficas e Isocuantas las
+    # comparten: al cambiar de página con los mismos parámetros no se redibujan.
+    def calcular():
+        L_vals, Q_vals = obtener_malla(A, a, b, K, L).corte_L()
+        curvas = [
+            (Q_vals, None, "Producción Q(L) con capital fijo K", "Producción (Q)"),
+            (b * Q_vals / L_vals, "orange", "Producto Marginal del Trabajo (PMg_L)", "PMg_L"),  # PMg_L = b·Q/L
+            (Q_vals / L_vals, "green", "Producto Medio del Trabajo (PMe_L)", "PMe_L"),
+        ]
+        pngs = []
+        for y, color, titulo, etiqueta in curvas:
+            fig, ax = plt.subplots()
+            ax.plot(L_vals, y, color=color)
+            ax.set_title(titulo)
+            ax.set_xlabel("Trabajo (L)")
+            ax.set_ylabel(etiqueta)
+            ax.grid(True)
+            pngs.append(figura_a_png(fig))
+        return pngs
+
+    return memo("graficas_trabajo", (A, a, b, K, L), calcular)
+
+
+def seccion_graficas_trabajo(A, a, b, K, L, titulo):
+    st.subheader(titulo)
+    for png in graficas_trabajo(A, a, b, K, L):
+        st.image(png, width="stretch")
@@ -0,0 +1,245 @@
+import cProfile
+import os
+import pstats
+import runpy
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+import pandas as pd
+import streamlit as st
+
+from modelos import memoria
+
+try:
+    from streamlit.runtime.scriptrunner_utils.exceptions import StopException
+except ImportError:  # versiones anteriores de streamlit
+    from streamlit.runtime.scriptrunner import StopException
+
+# Perfil de una sola ejecución de la página. Solo con PERFIL_ADMIN=1, se pide
+# con ?perfil=1 en la URL o con el botón de la barra lateral. La página se vuelve a
+# ejecutar completa bajo cProfile y un muestreador de pilas; se guardan un
+# .pstats y un archivo de pilas colapsadas (una línea "a;b;c N" por pila, el
+# formato de flamegraph.pl y speedscope) y se muestran las funciones más caras.
+# Con ?perfil=memoria la re-ejecución se mide con tracemalloc (modelos/memoria.py).
+#
+# Sin PERFIL_ADMIN no se hace nada: un visitante cualquiera no puede poner a
+# perfilar el servidor compartido. En PERFIL_DIR se conservan los archivos de
+# las últimas MAX_MEDICIONES mediciones.
+
+ADMIN = os.environ.get("PERFIL_ADMIN", "0") == "1"
+DIRECTORIO = os.environ.get("PERFIL_DIR", os.path.join(tempfile.gettempdir(), "perfiles"))
+# Segundos entre muestras de la pila
+INTERVALO = float(os.environ.get("PERFIL_INTERVALO", 0.002))
+MAX_MEDICIONES = int(os.environ.get("PERFIL_MAX_MEDICIONES", 20))
+EXTENSIONES = (".pstats", ".folded", ".tracemalloc")
+TOP_N = 25
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_local = threading.local()
+_lock_archivos = threading.Lock()
+
+
+def _nombre_marco(codigo):
+    ruta = codigo.co_filename
+    if ruta.startswith(RAIZ):
+        ruta = os.path.relpath(ruta, RAIZ)
+    else:
+        ruta = os.path.basename(ruta)
+    return f"{codigo.co_name} ({ruta}:{codigo.co_firstlineno})"
+
+
+class MuestreadorPilas:
+    # Toma la pila del hilo de la página cada INTERVALO segundos, desde la
+    # ejecución de la página hacia adentro.
+    def __init__(self, hilo, raiz, intervalo=INTERVALO):
+        self.hilo = hilo
+        self.raiz = raiz
+        self.intervalo = intervalo
+        self.pilas = Counter()
+        self._fin = threading.Event()
+        self._t = threading.Thread(target=self._muestrear, daemon=True, name="perfil-muestreo")
+
+    def _muestrear(self):
+        while not self._fin.wait(self.intervalo):
+            marco = sys._current_frames().get(self.hilo)
+            pila = []
+            while marco is not None and marco.f_code is not self.raiz:
+                pila.append(_nombre_marco(marco.f_code))
+                marco = marco.f_back
+            if pila and marco is not None:
+                self.pilas[";".join(reversed(pila))] += 1
+
+    def __enter__(self):
+        self._t.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._fin.set()
+        self._t.join()
+
+    def guardar(self, ruta):
+        with open(ruta, "w", encoding="utf-8") as f:
+            for pila, n in self.pilas.most_common():
+                f.write(f"{pila} {n}\n")
+
+
+def _ejecutar(archivo):
+    return runpy.run_path(archivo, run_name="__main__")
+
+
+def _ejecutar_detenible(archivo):
+    try:
+        return _ejecutar(archivo), False
+    except StopException:
+        # La página se detuvo sola (st.stop); la medición sigue siendo válida
+        return None, True
+
+
+def resumen(stats, n=TOP_N):
+    filas = []
+    for (archivo, linea, funcion), (cc, nc, tt, ct, _) in stats.stats.items():
+        if archivo.startswith(RAIZ):
+            archivo = os.path.relpath(archivo, RAIZ)
+        filas.append({
+            "Función": f"{funcion} ({os.path.basename(archivo)}:{linea})" if linea else funcion,
+            "Llamadas": nc,
+            "Tiempo propio (ms)": tt * 1000,
+            "Tiempo acumulado (ms)": ct * 1000,
+        })
+    tabla = pd.DataFrame(filas)
+    if tabla.empty:
+        return tabla
+    return tabla.sort_values("Tiempo propio (ms)", ascending=False).head(n).reset_index(drop=True)
+
+
+def _capturar(archivo):
+    base = _base(archivo)
+    perfil = cProfile.Profile()
+    _local.activo = True
+    muestras = MuestreadorPilas(threading.get_ident(), _ejecutar.__code__)
+    t0 = time.perf_counter()
+    try:
+        with muestras:
+            perfil.enable()
+            try:
+                _, detenida = _ejecutar_detenible(archivo)
+            finally:
+                perfil.disable()
+    finally:
+        _local.activo = False
+        duracion = time.perf_counter() - t0
+        perfil.dump_stats(base + ".pstats")
+        muestras.guardar(base + ".folded")
+    res = {
+        "base": base,
+        "duracion": duracion,
+        "muestras": sum(muestras.pilas.values()),
+        "pilas": len(muestras.pilas),
+        "tabla": resumen(pstats.Stats(perfil)),
+    }
+    return res, detenida
+
+
+def _capturar_memoria(archivo):
+    _local.activo = True
+    try:
+        return memoria.medir(lambda: _ejecutar_detenible(archivo), archivo, _base(archivo))
+    finally:
+        _local.activo = False
+
+
+def _rotar(conservar):
+    # Borra los archivos de las mediciones más viejas; memoria.csv se queda
+    bases = {}
+    for nombre in os.listdir(DIRECTORIO):
+        base, ext = os.path.splitext(nombre)
+        if ext in EXTENSIONES:
+            ruta = os.path.join(DIRECTORIO, nombre)
+            bases.setdefault(base, []).append(ruta)
+    viejas = sorted(bases, key=lambda b: max(os.path.getmtime(r) for r in bases[b]))
+    for base in viejas[:max(len(viejas) - conservar, 0)]:
+        for ruta in bases[base]:
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+
+
+def _base(archivo):
+    with _lock_archivos:
+        os.makedirs(DIRECTORIO, exist_ok=True)
+        # Lugar para la medición que empieza
+        _rotar(MAX_MEDICIONES - 1)
+    return os.path.join(DIRECTORIO, f"{os.path.splitext(os.path.basename(archivo))[0]}_"
+                                    f"{time.strftime('%Y%m%d-%H%M%S')}")
+
+
+def _pedir_perfil(modo):
+    st.session_state["_perfil_pendiente"] = modo
+
+
+def _mostrar(res):
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Duración", f"{res['duracion'] * 1000:.0f} ms")
+    c2.metric("Muestras de pila", f"{res['muestras']:,}")
+    c3.metric("Pilas distintas", f"{res['pilas']:,}")
+    st.dataframe(res["tabla"].round(2), hide_index=True, width="stretch")
+    st.caption(f"Archivos: {res['base']}.pstats, {res['base']}.folded")
+
+    d1, d2 = st.columns(2)
+    nombre = os.path.basename(res["base"])
+    with open(res["base"] + ".pstats", "rb") as f:
+        d1.download_button("Descargar .pstats", f.read(), file_name=nombre + ".pstats", on_click="ignore")
+    with open(res["base"] + ".folded", "rb") as f:
+        d2.download_button("Descargar pilas colapsadas", f.read(), file_name=nombre + ".folded",
+                           mime="text/plain", on_click="ignore")
+
+
+MODOS = {"1": ("Perfil", _capturar, _mostrar), "memoria": ("Memoria", _capturar_memoria, memoria.mostrar)}
+
+
+def perfilar_si_se_pide(archivo):
+    # Va al inicio de cada página, justo después de los imports.
+    if not ADMIN or getattr(_local, "activo", False):
+        # Apagado, o esta es la ejecución que se está perfilando
+        return
+
+    # Medición de una ejecución que terminó con st.stop (ver abajo)
+    anterior = st.session_state.pop("_perfil_detenida", None)
+    if anterior:
+        modo, res = anterior["res"]
+        titulo, _, mostrar = MODOS[modo]
+        with st.expander(f"{titulo} de la ejecución anterior (se detuvo con st.stop)", expanded=True):
+            mostrar(res)
+
+    modo = st.query_params.get("perfil")
+    if modo not in MODOS:
+        modo = st.session_state.pop("_perfil_pendiente", None)
+    if modo is None:
+        st.sidebar.button("Perfilar esta ejecución", on_click=_pedir_perfil, args=("1",),
+                          key="_perfil_boton")
+        st.sidebar.button("Medir memoria de esta ejecución", on_click=_pedir_perfil, args=("memoria",),
+                          key="_perfil_memoria_boton")
+        return
+
+    # Solo la siguiente ejecución: se quita el parámetro de la URL
+    st.query_params.pop("perfil", None)
+    titulo, capturar, mostrar = MODOS[modo]
+    # Tras st.stop ya no se puede dibujar ni escribir en session_state: el
+    # resultado se deja en un dict que ya está en session_state y se muestra
+    # al inicio de la siguiente ejecución
+    caja = st.session_state.setdefault("_perfil_detenida", {})
+    res, detenida = capturar(archivo)
+    if detenida:
+        caja["res"] = (modo, res)
+        raise StopException()
+    st.session_state.pop("_perfil_detenida", None)
+
+    st.divider()
+    st.subheader(f"{titulo} de esta ejecución")
+    mostrar(res)
+    st.stop()
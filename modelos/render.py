@@ -0,0 +1,205 @@
+import gc
+import io
+import multiprocessing as mp
+import os
+import sys
+import threading
+import time
+import types
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+import matplotlib.pyplot as plt
+import numpy as np
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# Pool de procesos para rasterizar figuras fuera del hilo de la sesión.
+# Agg retiene el GIL mientras dibuja; en otro proceso no bloquea a las demás
+# sesiones del servidor. Los arreglos viajan por memoria compartida y solo
+# regresan los bytes de la imagen.
+
+PROCESOS = int(os.environ.get("RENDER_PROCESOS", max(1, (os.cpu_count() or 2) - 1)))
+MAX_PENDIENTES = int(os.environ.get("RENDER_MAX_PENDIENTES", 4 * PROCESOS))
+# Lugares aparte para figuras fuera de una sesión (precálculo especulativo):
+# no compiten con las que el usuario está esperando
+MAX_FONDO = int(os.environ.get("RENDER_MAX_FONDO", 1))
+TIMEOUT = float(os.environ.get("RENDER_TIMEOUT", 30.0))
+# Cada cuánto se revisa, mientras se espera una figura, si la sesión ya pidió otra ejecución
+INTERVALO = float(os.environ.get("RENDER_INTERVALO", 0.1))
+# Generación de la espera más reciente de cada sesión, en st.session_state
+GENERACION = "_render_generacion"
+
+
+class ColaLlena(RuntimeError):
+    pass
+
+
+_lock_main = threading.Lock()
+
+
+@contextmanager
+def _sin_main_de_streamlit():
+    # Streamlit ejecuta cada página como el módulo "__main__" con __file__
+    # apuntando al script; con "spawn" los procesos nuevos volverían a ejecutar
+    # la página completa. Mientras se lanzan, se expone un "__main__" vacío.
+    with _lock_main:
+        actual = sys.modules.get("__main__")
+        vacio = types.ModuleType("__main__")
+        sys.modules["__main__"] = vacio
+        try:
+            yield
+        finally:
+            if sys.modules.get("__main__") is vacio:
+                sys.modules["__main__"] = actual
+
+
+def _a_memoria_compartida(arr):
+    arr = np.ascontiguousarray(arr)
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+    return shm, (shm.name, arr.shape, arr.dtype.str)
+
+
+def _trabajador(nombre_figura, descriptores, params, formato, dpi):
+    from modelos import figuras
+
+    bloques = []
+    arrays = {}
+    try:
+        for clave, (nombre, forma, dtype) in descriptores.items():
+            shm = shared_memory.SharedMemory(name=nombre)
+            bloques.append(shm)
+            arrays[clave] = np.ndarray(forma, dtype=dtype, buffer=shm.buf)
+
+        fig = getattr(figuras, nombre_figura)(arrays, **params)
+        buf = io.BytesIO()
+        # Mismos valores por omisión que st.pyplot
+        fig.savefig(buf, format=formato, dpi=dpi, bbox_inches="tight")
+        return buf.getvalue()
+    finally:
+        # La figura puede conservar vistas del buffer compartido; hay que
+        # soltarlas antes de cerrar el segmento.
+        fig = None
+        arrays.clear()
+        gc.collect()
+        for shm in bloques:
+            shm.close()
+
+
+class PoolRender:
+    def __init__(self, procesos=PROCESOS, max_pendientes=MAX_PENDIENTES, max_fondo=MAX_FONDO, timeout=TIMEOUT):
+        self.timeout = timeout
+        self._pool = ProcessPoolExecutor(max_workers=procesos, mp_context=mp.get_context("spawn"))
+        self._cupo = threading.BoundedSemaphore(max_pendientes)
+        self._cupo_fondo = threading.BoundedSemaphore(max_fondo)
+
+    def renderizar(self, nombre_figura, arrays, formato="png", dpi=200, interrumpir=None, fondo=False, **params):
+        # `interrumpir()` se consulta mientras se espera: si devuelve True (la
+        # sesión ya pidió otra ejecución) se deja de esperar y se lanza
+        # CancelledError; la figura se cancela si todavía no empezó. También
+        # puede lanzar directamente la excepción de control de Streamlit.
+        # Con `fondo` se usan los lugares del precálculo en vez de los de las sesiones.
+        cupo = self._cupo_fondo if fondo else self._cupo
+        if not cupo.acquire(blocking=False):
+            raise ColaLlena("Demasiadas figuras pendientes en el servidor")
+
+        bloques = []
+        fut = None
+        try:
+            descriptores = {}
+            for nombre, arr in arrays.items():
+                shm, desc = _a_memoria_compartida(arr)
+                bloques.append(shm)
+                descriptores[nombre] = desc
+
+            # submit() puede lanzar procesos nuevos del pool
+            with _sin_main_de_streamlit():
+                fut = self._pool.submit(_trabajador, nombre_figura, descriptores, params, formato, dpi)
+            # El lugar en la cola se libera cuando el trabajador termina de
+            # verdad, no cuando se deja de esperar: cancel() no detiene un render
+            # que ya empezó
+            fut.add_done_callback(lambda _: cupo.release())
+
+            limite = time.monotonic() + self.timeout
+            while True:
+                try:
+                    return fut.result(timeout=max(0.0, min(INTERVALO, limite - time.monotonic())))
+                except TimeoutError:
+                    if interrumpir is not None and interrumpir():
+                        raise CancelledError()
+                    if time.monotonic() >= limite:
+                        raise
+        except BaseException:
+            # También si `interrumpir()` lanzó la excepción de control de
+            # Streamlit: la figura se cancela si todavía no empezó
+            if fut is None:
+                cupo.release()
+            else:
+                fut.cancel()
+            raise
+        finally:
+            # Si el trabajador sigue adjunto, el segmento vive hasta que lo cierre.
+            for shm in bloques:
+                shm.close()
+                shm.unlink()
+
+    def cerrar(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+@st.cache_resource
+def obtener_pool():
+    return PoolRender()
+
+
+def interrupcion():
+    # Para esperas largas en el hilo de una sesión: una función que dice si la
+    # sesión ya pidió otra ejecución. Fuera de una sesión (p. ej. un precálculo
+    # en segundo plano) no hay una ejecución más reciente que la reemplace: None.
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return None
+    generacion = st.session_state.get(GENERACION, 0) + 1
+    st.session_state[GENERACION] = generacion
+    # Leer st.session_state desde el hilo de la sesión es un punto de cesión,
+    # como cualquier st.*: si la sesión ya pidió otra ejecución, la lectura
+    # lanza la excepción de control de Streamlit y la espera termina ahí. Una
+    # generación distinta indica una espera más reciente de la misma sesión.
+    return lambda: st.session_state.get(GENERACION) != generacion
+
+
+def renderizar_figura(nombre_figura, arrays, **params):
+    # Sin sesión, la figura va por los lugares de fondo
+    interrumpir = interrupcion()
+    return obtener_pool().renderizar(nombre_figura, arrays, interrumpir=interrumpir,
+                                     fondo=interrumpir is None, **params)
+
+
+def mostrar_png(generar):
+    # `generar` devuelve los bytes PNG (por ejemplo, llamando a renderizar_figura)
+    try:
+        png = generar()
+    except CancelledError:
+        # La sesión ya pidió otra ejecución: esta deja de esperar la figura.
+        st.stop()
+    except ColaLlena:
+        st.warning("El servidor está ocupado dibujando otras figuras; intenta de nuevo en un momento.")
+        return None
+    except TimeoutError:
+        st.warning("La figura tardó demasiado en generarse y se canceló.")
+        return None
+    st.image(png, width="stretch")
+    return png
+
+
+def mostrar_figura(nombre_figura, arrays, **params):
+    return mostrar_png(lambda: renderizar_figura(nombre_figura, arrays, **params))
+
+
+def figura_a_png(fig):
+    # Los mismos valores que usa st.pyplot; la figura se cierra al terminar
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=200, bbox_inches="tight")
+    plt.close(fig)
+    return buf.getvalue()
@@ -0,0 +1,25 @@
+import numpy as np
+
+EPS = 1e-9
+
+
+def tipo_rendimientos(l, k, tol=1e-6):
+    s = l + k
+    if s > 1 + tol:
+        return "Rendimientos crecientes (IRS)", s
+    if s < 1 - tol:
+        return "Rendimientos decrecientes (DRS)", s
+    return "Rendimientos constantes (CRS)", s
+
+
+def find_break_even(L_vals, CM_vals, P):
+    y = CM_vals - P
+    sgn = np.sign(y)
+    idx = np.where(sgn[:-1] * sgn[1:] < 0)[0]
+    roots = []
+    for i in idx:
+        x0, x1 = L_vals[i], L_vals[i + 1]
+        y0, y1 = y[i], y[i + 1]
+        xr = x0 - y0 * (x1 - x0) / (y1 - y0)
+        roots.append(float(xr))
+    return roots
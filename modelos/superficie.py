@@ -0,0 +1,262 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+
+import numpy as np
+import streamlit as st
+
+# Superficie Cobb-Douglas de alta resolución (miles × miles de puntos) con la
+# memoria acotada. La malla se recorre por bloques de filas de L: en cada bloque
+# se calculan Q, PMg_L, PMg_K y la RMST, se toma la submuestra que va a la
+# gráfica y, si se pide, el bloque se escribe a un .npy en disco. Solo un
+# bloque vive en memoria a la vez, así que el pico de RSS no depende de n.
+#
+# Los .npy se leen después sin cargarlos:  np.load(ruta, mmap_mode="r")
+#
+# Cada malla en disco va en su propia carpeta dentro de DIRECTORIO. La carpeta
+# se borra cuando la SuperficieAlta deja de existir (p. ej. al cerrar la
+# sesión); las que quedan de procesos anteriores se borran al pasar
+# MAX_EDAD_H horas, y no se crea una nueva si se pasarían los topes.
+
+MAX_RSS_MB = float(os.environ.get("SUPERFICIE_MAX_RSS_MB", 1024))
+# Tope del bloque aunque sobre memoria; bloques más chicos se mantienen en caché
+MAX_BLOQUE_MB = float(os.environ.get("SUPERFICIE_MAX_BLOQUE_MB", 64))
+DIRECTORIO = os.environ.get("SUPERFICIE_DIR", os.path.join(tempfile.gettempdir(), "superficies"))
+MAX_DIRECTORIOS = int(os.environ.get("SUPERFICIE_MAX_DIRECTORIOS", 4))
+MAX_DISCO_GB = float(os.environ.get("SUPERFICIE_MAX_DISCO_GB", 32))
+MAX_EDAD_H = float(os.environ.get("SUPERFICIE_MAX_EDAD_H", 24))
+
+CAMPOS = {
+    "Q": "Producción (Q)",
+    "PMg_L": "Producto marginal del trabajo (PMg_L)",
+    "PMg_K": "Producto marginal del capital (PMg_K)",
+    "RMST": "Relación marginal de sustitución técnica (PMg_L / PMg_K)",
+}
+
+# Arreglos de (filas × n) vivos a la vez al procesar un bloque: los cuatro
+# campos más temporales de las operaciones
+_ARREGLOS_POR_BLOQUE = 6
+
+# Carpetas de DIRECTORIO con una SuperficieAlta viva en este proceso
+_en_uso = set()
+_lock_disco = threading.Lock()
+
+
+def rss_mb():
+    # RSS actual del proceso; 0 si el sistema no expone /proc
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        return 0.0
+
+
+def filas_por_bloque(n, max_rss_mb=MAX_RSS_MB):
+    disponible = min(max_rss_mb - rss_mb(), MAX_BLOQUE_MB)
+    por_fila = n * 8 * _ARREGLOS_POR_BLOQUE / 2**20
+    if disponible < por_fila:
+        raise MemoryError(
+            f"No cabe ni una fila de {n:,} puntos en el límite de {max_rss_mb:.0f} MB "
+            f"(el proceso ya usa {rss_mb():.0f} MB)"
+        )
+    return max(1, min(n, int(disponible // por_fila)))
+
+
+def bytes_en_disco(n):
+    return len(CAMPOS) * n * n * 8
+
+
+def _tamano(ruta):
+    total = 0
+    for raiz, _, archivos in os.walk(ruta):
+        for nombre in archivos:
+            try:
+                total += os.path.getsize(os.path.join(raiz, nombre))
+            except OSError:
+                pass
+    return total
+
+
+def liberar_directorio(ruta):
+    shutil.rmtree(ruta, ignore_errors=True)
+    with _lock_disco:
+        _en_uso.discard(ruta)
+
+
+def directorio_nuevo(prefijo, necesarios):
+    # Carpeta nueva en DIRECTORIO para `necesarios` bytes; OSError si no cabe
+    with _lock_disco:
+        os.makedirs(DIRECTORIO, exist_ok=True)
+        limite = time.time() - MAX_EDAD_H * 3600
+        ocupados = []
+        for entrada in os.scandir(DIRECTORIO):
+            if not entrada.is_dir():
+                continue
+            if entrada.path not in _en_uso and entrada.stat().st_mtime < limite:
+                shutil.rmtree(entrada.path, ignore_errors=True)
+            else:
+                ocupados.append(_tamano(entrada.path))
+
+        tope = MAX_DISCO_GB * 2**30
+        if len(ocupados) >= MAX_DIRECTORIOS or sum(ocupados) + necesarios > tope:
+            raise OSError(
+                f"Ya hay {len(ocupados)} mallas en disco ({sum(ocupados) / 2**30:.1f} GB); el límite es "
+                f"{MAX_DIRECTORIOS} mallas y {MAX_DISCO_GB:g} GB en {DIRECTORIO}"
+            )
+        ruta = tempfile.mkdtemp(prefix=f"{prefijo}_", dir=DIRECTORIO)
+        _en_uso.add(ruta)
+        return ruta
+
+
+def _campos(A, a, b, Ka, K, Lb, L):
+    # Q es un producto exterior (K^a por columna, L^b por fila); los
+    # productos marginales salen de Q sin volver a elevar a potencias.
+    Q = A * Lb[:, np.newaxis] * Ka[np.newaxis, :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        PMg_L = b * Q / L[:, np.newaxis]
+        PMg_K = a * Q / K[np.newaxis, :]
+        # RMST = (b/a)·K/L, no depende de Q
+        RMST = np.divide(PMg_L, PMg_K)
+    return {"Q": Q, "PMg_L": PMg_L, "PMg_K": PMg_K, "RMST": RMST}
+
+
+class SuperficieAlta:
+    def __init__(self, A, a, b, K, L, n, vista=120, directorio=None,
+                 max_rss_mb=MAX_RSS_MB, progreso=None):
+        self.n = int(n)
+        self.K = np.linspace(1, K * 3, self.n)
+        self.L = np.linspace(1, L * 3, self.n)
+        self.directorio = directorio
+        self.archivos = {}
+        # La carpeta se borra cuando la superficie deja de existir
+        self._limpieza = weakref.finalize(self, liberar_directorio, directorio) if directorio else None
+
+        # Filas y columnas que se muestran (muestras exactas, sin promediar)
+        sel = np.unique(np.linspace(0, self.n - 1, min(vista, self.n)).round().astype(int))
+        self.vista_K = self.K[sel]
+        self.vista_L = self.L[sel]
+        self.vista = {c: np.empty((len(sel), len(sel))) for c in CAMPOS}
+        self.rangos = {c: (np.inf, -np.inf) for c in CAMPOS}
+
+        destinos = {}
+        if directorio is not None:
+            for c in CAMPOS:
+                ruta = os.path.join(directorio, f"{c}.npy")
+                # open_memmap escribe el encabezado .npy; luego cada bloque se
+                # mapea por separado a partir de su desplazamiento
+                mm = np.lib.format.open_memmap(ruta, mode="w+", dtype=np.float64,
+                                               shape=(self.n, self.n))
+                destinos[c] = mm.offset
+                del mm
+                self.archivos[c] = ruta
+
+        Ka = self.K ** a
+        filas = filas_por_bloque(self.n, max_rss_mb)
+        self.filas_bloque = filas
+        self.pico_rss = rss_mb()
+
+        for i0 in range(0, self.n, filas):
+            i1 = min(i0 + filas, self.n)
+            L_blq = self.L[i0:i1]
+            bloque = _campos(A, a, b, Ka, self.K, L_blq ** b, L_blq)
+
+            # Filas de la vista que caen en este bloque
+            en_blq = (sel >= i0) & (sel < i1)
+            for c, datos in bloque.items():
+                if en_blq.any():
+                    self.vista[c][en_blq] = datos[sel[en_blq] - i0][:, sel]
+                finitos = datos[np.isfinite(datos)]
+                if finitos.size:
+                    lo, hi = self.rangos[c]
+                    self.rangos[c] = (min(lo, finitos.min()), max(hi, finitos.max()))
+                del finitos
+
+                if c in destinos:
+                    # Ventana solo sobre las filas del bloque: al soltarla, sus
+                    # páginas dejan de contar en el RSS del proceso
+                    ventana = np.memmap(self.archivos[c], dtype=np.float64, mode="r+",
+                                        offset=destinos[c] + i0 * self.n * 8,
+                                        shape=(i1 - i0, self.n))
+                    ventana[...] = datos
+                    ventana.flush()
+                    del ventana
+
+            del bloque
+            self.pico_rss = max(self.pico_rss, rss_mb())
+            if progreso is not None:
+                progreso(i1 / self.n)
+
+        for arr in self.vista.values():
+            arr.flags.writeable = False
+
+    def abrir(self, campo):
+        # Campo completo desde disco, sin cargarlo en memoria
+        return np.load(self.archivos[campo], mmap_mode="r")
+
+    def borrar(self):
+        if self._limpieza is not None:
+            self._limpieza()
+            self.directorio = None
+            self.archivos = {}
+
+
+def seccion_alta_resolucion(A, a, b, K, L, nombre_base):
+    # Regresa (SuperficieAlta, campo) para estos parámetros, o None si el modo
+    # está apagado o todavía no se ha calculado.
+    clave_estado = f"superficie_alta_{nombre_base}"
+    with st.expander("Superficie de alta resolución"):
+        activo = st.toggle("Usar la malla de alta resolución", key=f"alta_on_{nombre_base}")
+        c1, c2 = st.columns(2)
+        n = c1.number_input("Puntos por eje", value=5000, min_value=200, max_value=20000, step=500,
+                            key=f"alta_n_{nombre_base}")
+        campo = c2.selectbox("Campo a mostrar", list(CAMPOS), format_func=CAMPOS.get,
+                             key=f"alta_campo_{nombre_base}")
+        en_disco = st.checkbox(
+            f"Guardar la malla completa en disco (.npy, ~{bytes_en_disco(n) / 2**30:.1f} GB)",
+            key=f"alta_disco_{nombre_base}",
+        )
+        st.caption(f"Se evalúa por bloques; el proceso no pasa de {MAX_RSS_MB:.0f} MB de memoria residente.")
+
+        if not activo:
+            return None
+
+        params = (A, a, b, K, L, int(n), en_disco)
+        guardado = st.session_state.get(clave_estado)
+        if guardado is not None and guardado[0] != params:
+            guardado[1].borrar()
+            guardado = None
+            st.session_state.pop(clave_estado, None)
+
+        if guardado is None:
+            if not st.button("Calcular superficie", key=f"alta_btn_{nombre_base}"):
+                return None
+            avance = st.progress(0.0, text="Evaluando por bloques…")
+            directorio = None
+            try:
+                if en_disco:
+                    directorio = directorio_nuevo(nombre_base, bytes_en_disco(int(n)))
+                sup = SuperficieAlta(A, a, b, K, L, n, directorio=directorio,
+                                     progreso=lambda f: avance.progress(f, text=f"{f:.0%}"))
+            except (MemoryError, OSError) as e:
+                if directorio is not None:
+                    liberar_directorio(directorio)
+                avance.empty()
+                st.error(f"No se pudo calcular la superficie: {e}")
+                return None
+            avance.empty()
+            guardado = (params, sup)
+            st.session_state[clave_estado] = guardado
+
+        sup = guardado[1]
+        lo, hi = sup.rangos[campo]
+        c3, c4, c5 = st.columns(3)
+        c3.metric("Puntos evaluados", f"{sup.n ** 2:,}")
+        c4.metric("Filas por bloque", f"{sup.filas_bloque:,}")
+        c5.metric("Pico de memoria", f"{sup.pico_rss:.0f} MB")
+        st.caption(f"{CAMPOS[campo]}: mínimo {lo:.6g}, máximo {hi:.6g} en la malla completa.")
+        if sup.archivos:
+            st.caption("Archivos: " + ", ".join(sup.archivos.values()))
+        return sup, campo
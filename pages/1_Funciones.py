@@ -1,5 +1,10 @@
 import streamlit as st
 
+from modelos.modelo_cobb import entrada
+from modelos.perfil import perfilar_si_se_pide
+
+perfilar_si_se_pide(__file__)
+
 st.title("Calculadora de Funciones de Producción")
 
 opcion = st.selectbox(
@@ -48,14 +53,15 @@ if opcion == "Lineal: Q = K + L":
 
 
 elif opcion == "Cobb-Douglas: Q = A · K^a · L^b":
-    A = st.number_input("Constante de eficiencia (A)", min_value=0.0, value=1.0)
+    # Valores compartidos con Gráficas e Isocuantas (ver modelos/modelo_cobb.py)
+    A = entrada("A", "Constante de eficiencia (A)", "funciones")
 
     # CAMBIO MÍNIMO: evitar K=0 y L=0 para no romper PMg con exponentes < 1
-    K = st.number_input("Capital (K)", min_value=0.0001, value=10.0)
-    L = st.number_input("Trabajo (L)", min_value=0.0001, value=5.0)
+    K = entrada("K", "Capital (K)", "funciones", min_value=0.0001)
+    L = entrada("L", "Trabajo (L)", "funciones", min_value=0.0001)
 
-    a = st.number_input("Elasticidad del capital (a)", min_value=0.0, value=0.5)
-    b = st.number_input("Elasticidad del trabajo (b)", min_value=0.0, value=0.5)
+    a = entrada("a", "Elasticidad del capital (a)", "funciones")
+    b = entrada("b", "Elasticidad del trabajo (b)", "funciones")
 
     if st.button("Calcular Q"):
         Q = produccion_cobb_douglas(A, K, L, a, b)
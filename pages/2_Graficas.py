@@ -1,7 +1,15 @@
 import streamlit as st
-import numpy as np
 import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D 
+
+from modelos.animacion import seccion_animacion
+from modelos.cobb import produccion_cobb, pmgL_cobb, pmgK_cobb
+from modelos.mallas import obtener_malla
+from modelos.modelo_cobb import entrada, estimado, memo, seccion_graficas_trabajo
+from modelos.perfil import perfilar_si_se_pide
+from modelos.render import mostrar_figura, mostrar_png, renderizar_figura
+from modelos.superficie import CAMPOS, seccion_alta_resolucion
+
+perfilar_si_se_pide(__file__)
 
 plt.style.use("seaborn-v0_8")  
 
@@ -19,25 +27,17 @@ opcion = st.sidebar.selectbox(
 )
 
 with st.sidebar.expander("Parámetros de Producción"):
-    K = st.number_input("Capital (K)", value=10.0, min_value=0.1)
-    L = st.number_input("Trabajo (L)", value=5.0, min_value=0.1)
+    K = entrada("K", "Capital (K)", "graficas", min_value=0.1)
+    L = entrada("L", "Trabajo (L)", "graficas", min_value=0.1)
 
 if opcion == "Cobb-Douglas: Q = A · K^a · L^b":
-    with st.sidebar.expander("Parámetros Cobb-Douglas"):
-        A = st.number_input("Eficiencia total (A)", value=1.0, min_value=0.0)
-        a = st.number_input("Elasticidad del Capital (a)", value=0.5, min_value=0.0)
-        b = st.number_input("Elasticidad del Trabajo (b)", value=0.5, min_value=0.0)
-
-
-
-def produccion_cobb(A, K, L, a, b):
-    return A * (K**a) * (L**b)
-
-def pmgL_cobb(A, K, L, a, b):
-    return A * b * (K**a) * (L**(b-1))
-
-def pmgK_cobb(A, K, L, a, b):
-    return A * a * (K**(a-1)) * (L**b)
+    # Valores compartidos con Funciones e Isocuantas (ver modelos/modelo_cobb.py)
+    with st.sidebar.expander("Parámetros Cobb-Douglas", expanded=estimado()):
+        A = entrada("A", "Eficiencia total (A)", "graficas")
+        a = entrada("a", "Elasticidad del Capital (a)", "graficas")
+        b = entrada("b", "Elasticidad del Trabajo (b)", "graficas")
+        if estimado():
+            st.caption("Valores tomados de la estimación con datos.")
 
 
 
@@ -61,58 +61,27 @@ if opcion == "Cobb-Douglas: Q = A · K^a · L^b":
     col4.metric("PMe del Trabajo (PMe_L)", f"{PMe_L:.4f}")
     col5.metric("PMe del Capital (PMe_K)", f"{PMe_K:.4f}")
 
-    L_vals = np.linspace(1, L * 3, 100)
-    Q_vals = produccion_cobb(A, K, L_vals, a, b)
-    PMg_vals = pmgL_cobb(A, K, L_vals, a, b)
-    PMe_vals = Q_vals / L_vals
-
-    st.subheader("Gráficas 2D")
-
-    # Producción Q(L)
-    fig1, ax1 = plt.subplots()
-    ax1.plot(L_vals, Q_vals)
-    ax1.set_title("Producción Cobb-Douglas con Capital fijo K")
-    ax1.set_xlabel("Trabajo (L)")
-    ax1.set_ylabel("Producción (Q)")
-    ax1.grid(True)
-    st.pyplot(fig1)
-
-    # Producto Marginal del Trabajo
-    fig2, ax2 = plt.subplots()
-    ax2.plot(L_vals, PMg_vals, color="orange")
-    ax2.set_title("Producto Marginal del Trabajo (PMg_L)")
-    ax2.set_xlabel("Trabajo (L)")
-    ax2.set_ylabel("PMg_L")
-    ax2.grid(True)
-    st.pyplot(fig2)
-
-    # Producto Medio del Trabajo
-    fig3, ax3 = plt.subplots()
-    ax3.plot(L_vals, PMe_vals, color="green")
-    ax3.set_title("Producto Medio del Trabajo (PMe_L)")
-    ax3.set_xlabel("Trabajo (L)")
-    ax3.set_ylabel("PMe_L")
-    ax3.grid(True)
-    st.pyplot(fig3)
+    entradas = (A, a, b, K, L)
 
+    seccion_graficas_trabajo(A, a, b, K, L, "Gráficas 2D")
 
-    st.subheader("Superficie 3D de la Función de Producción")
 
-    K_vals = np.linspace(1, K * 3, 40)
-    L_vals2 = np.linspace(1, L * 3, 40)
-    K_mesh, L_mesh = np.meshgrid(K_vals, L_vals2)
+    st.subheader("Superficie 3D de la Función de Producción")
 
-    Q_mesh = produccion_cobb(A, K_mesh, L_mesh, a, b)
+    alta = seccion_alta_resolucion(A, a, b, K, L, nombre_base="cobb_douglas")
 
-    fig4 = plt.figure(figsize=(8, 6))
-    ax4 = fig4.add_subplot(111, projection="3d")
-    ax4.plot_surface(K_mesh, L_mesh, Q_mesh, cmap="viridis", edgecolor="none")
-    ax4.set_title("Superficie 3D – Función Cobb-Douglas")
-    ax4.set_xlabel("K")
-    ax4.set_ylabel("L")
-    ax4.set_zlabel("Q")
+    # Se rasteriza en el pool de procesos para no bloquear otras sesiones
+    if alta is None:
+        def superficie_png():
+            K_vals, L_vals2, Q_mesh = obtener_malla(A, a, b, K, L).superficie()
+            return renderizar_figura("superficie_cobb", {"K": K_vals, "L": L_vals2, "Q": Q_mesh})
 
-    st.pyplot(fig4)
+        # La misma superficie que en Isocuantas: la PNG se comparte entre ambas páginas
+        mostrar_png(lambda: memo("superficie", entradas, superficie_png))
+    else:
+        sup, campo = alta
+        mostrar_figura("superficie_cobb", {"K": sup.vista_K, "L": sup.vista_L, "Q": sup.vista[campo]},
+                       titulo=f"Superficie 3D – {CAMPOS[campo]} ({sup.n:,}×{sup.n:,})", zlabel=campo)
 
 
-    
\ No newline at end of file
+    seccion_animacion(A, a, b, K, L, paneles=("Q", "PMg_L"), nombre_base="cobb_douglas")
@@ -1,7 +1,16 @@
 import streamlit as st
 import numpy as np
 import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
+
+from modelos.animacion import seccion_animacion
+from modelos.cobb import produccion_cobb, pmgL_cobb, pmgK_cobb
+from modelos.mallas import obtener_malla
+from modelos.modelo_cobb import entrada, estimado, memo, seccion_graficas_trabajo
+from modelos.perfil import perfilar_si_se_pide
+from modelos.render import figura_a_png, mostrar_figura, mostrar_png, renderizar_figura
+from modelos.superficie import CAMPOS, seccion_alta_resolucion
+
+perfilar_si_se_pide(__file__)
 
 plt.style.use("seaborn-v0_8")  # Estilo general
 
@@ -18,25 +27,17 @@ opcion = st.sidebar.selectbox(
 )
 
 with st.sidebar.expander("Parámetros de Producción"):
-    K = st.number_input("Capital (K)", value=10.0, min_value=0.1)
-    L = st.number_input("Trabajo (L)", value=5.0, min_value=0.1)
+    K = entrada("K", "Capital (K)", "isocuantas", min_value=0.1)
+    L = entrada("L", "Trabajo (L)", "isocuantas", min_value=0.1)
 
 if opcion == "Cobb-Douglas: Q = A · K^a · L^b":
-    with st.sidebar.expander("Parámetros Cobb-Douglas"):
-        A = st.number_input("Eficiencia total (A)", value=1.0, min_value=0.0)
-        a = st.number_input("Elasticidad del Capital (a)", value=0.5, min_value=0.0)
-        b = st.number_input("Elasticidad del Trabajo (b)", value=0.5, min_value=0.0)
-
-
-
-def produccion_cobb(A, K, L, a, b):
-    return A * (K**a) * (L**b)
-
-def pmgL_cobb(A, K, L, a, b):
-    return A * b * (K**a) * (L**(b-1))
-
-def pmgK_cobb(A, K, L, a, b):
-    return A * a * (K**(a-1)) * (L**b)
+    # Valores compartidos con Funciones y Gráficas (ver modelos/modelo_cobb.py)
+    with st.sidebar.expander("Parámetros Cobb-Douglas", expanded=estimado()):
+        A = entrada("A", "Eficiencia total (A)", "isocuantas")
+        a = entrada("a", "Elasticidad del Capital (a)", "isocuantas")
+        b = entrada("b", "Elasticidad del Trabajo (b)", "isocuantas")
+        if estimado():
+            st.caption("Valores tomados de la estimación con datos.")
 
 
 
@@ -62,119 +63,95 @@ if opcion == "Cobb-Douglas: Q = A · K^a · L^b":
 
 
 
-    st.subheader("Gráficas del Trabajo (L)")
+    entradas = (A, a, b, K, L)
 
-    L_vals = np.linspace(1, L * 3, 100)
-    Q_vals = produccion_cobb(A, K, L_vals, a, b)
-    PMg_vals = pmgL_cobb(A, K, L_vals, a, b)
-    PMe_vals = Q_vals / L_vals
+    def graficas_capital():
+        K_vals_plot, Q_K_vals = obtener_malla(A, a, b, K, L).corte_K()
+        PMg_K_vals = a * Q_K_vals / K_vals_plot  # PMg_K = a·Q/K
+        PMe_K_vals = Q_K_vals / K_vals_plot
 
-    # Producción Q(L)
-    fig1, ax1 = plt.subplots()
-    ax1.plot(L_vals, Q_vals)
-    ax1.set_title("Producción Q(L)")
-    ax1.set_xlabel("Trabajo (L)")
-    ax1.set_ylabel("Producción (Q)")
-    ax1.grid(True)
-    st.pyplot(fig1)
+        # Producción Q(K)
+        figK, axK = plt.subplots()
+        axK.plot(K_vals_plot, Q_K_vals, color="purple")
+        axK.set_title("Producción Q(K)")
+        axK.set_xlabel("Capital (K)")
+        axK.set_ylabel("Producción (Q)")
+        axK.grid(True)
 
-    # Producto Marginal del Trabajo
-    fig2, ax2 = plt.subplots()
-    ax2.plot(L_vals, PMg_vals, color="orange")
-    ax2.set_title("Producto Marginal del Trabajo (PMg_L)")
-    ax2.set_xlabel("Trabajo (L)")
-    ax2.set_ylabel("PMg_L")
-    ax2.grid(True)
-    st.pyplot(fig2)
+        # PMg(K)
+        figPMgK, axPMgK = plt.subplots()
+        axPMgK.plot(K_vals_plot, PMg_K_vals, color="red")
+        axPMgK.set_title("Producto Marginal del Capital (PMg_K)")
+        axPMgK.set_xlabel("Capital (K)")
+        axPMgK.set_ylabel("PMg_K")
+        axPMgK.grid(True)
 
-    # Producto Medio del Trabajo
-    fig3, ax3 = plt.subplots()
-    ax3.plot(L_vals, PMe_vals, color="green")
-    ax3.set_title("Producto Medio del Trabajo (PMe_L)")
-    ax3.set_xlabel("Trabajo (L)")
-    ax3.set_ylabel("PMe_L")
-    ax3.grid(True)
-    st.pyplot(fig3)
+        # PMe(K)
+        figPMeK, axPMeK = plt.subplots()
+        axPMeK.plot(K_vals_plot, PMe_K_vals, color="teal")
+        axPMeK.set_title("Producto Medio del Capital (PMe_K)")
+        axPMeK.set_xlabel("Capital (K)")
+        axPMeK.set_ylabel("PMe_K")
+        axPMeK.grid(True)
 
+        return [figura_a_png(f) for f in (figK, figPMgK, figPMeK)]
 
+    def superficie_png():
+        K_vals3, L_vals3, Q_mesh = obtener_malla(A, a, b, K, L).superficie()
+        return renderizar_figura("superficie_cobb", {"K": K_vals3, "L": L_vals3, "Q": Q_mesh})
 
-    st.subheader(" Gráficas del Capital (K) ")
+    def isocuantas():
+        K_range, L_range, Q_grid = obtener_malla(A, a, b, K, L).contorno()
 
-    K_vals_plot = np.linspace(1, K * 3, 100)
-    Q_K_vals = produccion_cobb(A, K_vals_plot, L, a, b)
-    PMg_K_vals = pmgK_cobb(A, K_vals_plot, L, a, b)
-    PMe_K_vals = Q_K_vals / K_vals_plot
-
-    # Producción Q(K)
-    figK, axK = plt.subplots()
-    axK.plot(K_vals_plot, Q_K_vals, color="purple")
-    axK.set_title("Producción Q(K)")
-    axK.set_xlabel("Capital (K)")
-    axK.set_ylabel("Producción (Q)")
-    axK.grid(True)
-    st.pyplot(figK)
-
-    # PMg(K)
-    figPMgK, axPMgK = plt.subplots()
-    axPMgK.plot(K_vals_plot, PMg_K_vals, color="red")
-    axPMgK.set_title("Producto Marginal del Capital (PMg_K)")
-    axPMgK.set_xlabel("Capital (K)")
-    axPMgK.set_ylabel("PMg_K")
-    axPMgK.grid(True)
-    st.pyplot(figPMgK)
-
-    # PMe(K)
-    figPMeK, axPMeK = plt.subplots()
-    axPMeK.plot(K_vals_plot, PMe_K_vals, color="teal")
-    axPMeK.set_title("Producto Medio del Capital (PMe_K)")
-    axPMeK.set_xlabel("Capital (K)")
-    axPMeK.set_ylabel("PMe_K")
-    axPMeK.grid(True)
-    st.pyplot(figPMeK)
+        figIQ, axIQ = plt.subplots(figsize=(7, 5))
 
+        niveles_Q = np.linspace(Q * 0.4, Q * 2, 6)
 
+        contours = axIQ.contour(
+            K_range, L_range, Q_grid,
+            levels=niveles_Q,
+            cmap="viridis"
+        )
 
-    st.subheader("Superficie 3D de la Función de Producción")
+        axIQ.clabel(contours, inline=True, fontsize=8)
+        axIQ.set_title("Isocuantas Cobb-Douglas")
+        axIQ.set_xlabel("Capital (K)")
+        axIQ.set_ylabel("Trabajo (L)")
+        axIQ.grid(True)
 
-    K_vals3 = np.linspace(1, K * 3, 40)
-    L_vals3 = np.linspace(1, L * 3, 40)
-    K_mesh, L_mesh = np.meshgrid(K_vals3, L_vals3)
-    Q_mesh = produccion_cobb(A, K_mesh, L_mesh, a, b)
+        return figura_a_png(figIQ)
 
-    fig4 = plt.figure(figsize=(8, 6))
-    ax4 = fig4.add_subplot(111, projection="3d")
-    ax4.plot_surface(K_mesh, L_mesh, Q_mesh, cmap="viridis", edgecolor="none")
-    ax4.set_title("Superficie 3D – Función Cobb-Douglas")
-    ax4.set_xlabel("K")
-    ax4.set_ylabel("L")
-    ax4.set_zlabel("Q")
+    # Las PNG se guardan en la sesión y se reutilizan mientras no cambien A, a, b, K, L
 
-    st.pyplot(fig4)
+    seccion_graficas_trabajo(A, a, b, K, L, "Gráficas del Trabajo (L)")
 
- 
 
-    st.subheader(" Isocuantas de la Función de Producción")
 
-    K_range = np.linspace(1, K * 3, 50)
-    L_range = np.linspace(1, L * 3, 50)
-    K_grid, L_grid = np.meshgrid(K_range, L_range)
+    st.subheader(" Gráficas del Capital (K) ")
+
+    for png in memo("isocuantas_capital", entradas, graficas_capital):
+        st.image(png, width="stretch")
+
+
 
-    Q_grid = produccion_cobb(A, K_grid, L_grid, a, b)
+    st.subheader("Superficie 3D de la Función de Producción")
+
+    alta = seccion_alta_resolucion(A, a, b, K, L, nombre_base="isocuantas")
 
-    figIQ, axIQ = plt.subplots(figsize=(7, 5))
+    # Se rasteriza en el pool de procesos para no bloquear otras sesiones
+    if alta is None:
+        # La misma superficie que en Gráficas: la PNG se comparte entre ambas páginas
+        mostrar_png(lambda: memo("superficie", entradas, superficie_png))
+    else:
+        sup, campo = alta
+        mostrar_figura("superficie_cobb", {"K": sup.vista_K, "L": sup.vista_L, "Q": sup.vista[campo]},
+                       titulo=f"Superficie 3D – {CAMPOS[campo]} ({sup.n:,}×{sup.n:,})", zlabel=campo)
 
-    niveles_Q = np.linspace(Q * 0.4, Q * 2, 6)
+ 
+
+    st.subheader(" Isocuantas de la Función de Producción")
 
-    contours = axIQ.contour(
-        K_grid, L_grid, Q_grid,
-        levels=niveles_Q,
-        cmap="viridis"
-    )
+    st.image(memo("isocuantas_contorno", entradas, isocuantas), width="stretch")
 
-    axIQ.clabel(contours, inline=True, fontsize=8)
-    axIQ.set_title("Isocuantas Cobb-Douglas")
-    axIQ.set_xlabel("Capital (K)")
-    axIQ.set_ylabel("Trabajo (L)")
-    axIQ.grid(True)
 
-    st.pyplot(figIQ)
+    seccion_animacion(A, a, b, K, L, paneles=("Q", "PMg_L", "isocuantas"), nombre_base="isocuantas")
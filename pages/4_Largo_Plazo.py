@@ -1,6 +1,11 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
+
+from modelos.especulacion import resultado
+from modelos.perfil import perfilar_si_se_pide
+from modelos.render import mostrar_png, renderizar_figura
+
+perfilar_si_se_pide(__file__)
 
 
 st.title("Costo Medio de Largo Plazo (CMLP) – Envolvente de técnicas")
@@ -8,7 +13,7 @@ st.title("Costo Medio de Largo Plazo (CMLP) – Envolvente de técnicas")
 
 with st.sidebar:
     st.header("Parámetros")
-    st.caption("Ajusta niveles y pendientes de cada técnica. La CMLP es la envolvente (mínimo) entre CM1, CM2 y CM3.")
+    st.caption("Ajusta niveles y pendientes de cada técnica. La CMLP es la envolvente (mínimo) entre CM1, CM2, CM3 y las técnicas intermedias.")
 
     st.subheader("Técnica 1 (CM1)")
     a1 = st.number_input("a₁ (nivel)", value=120.0, min_value=0.0, step=5.0)
@@ -31,6 +36,11 @@ with st.sidebar:
     st.divider()
     Qmax = st.number_input("Máximo del eje X (Cantidad)", value=120.0, min_value=2.0, step=5.0)
     npts = st.slider("Resolución (puntos)", min_value=200, max_value=1200, value=500, step=50)
+    n_familia = st.slider("Técnicas intermedias entre CM1 y CM3", min_value=0, max_value=500, value=0, step=10,
+                          help="Técnicas sobre una frontera convexa entre la técnica 1 y la 3 (a y b se "
+                               "interpolan geométricamente). Si una técnica tiene menor a y la otra menor b, "
+                               "cerca del cruce de CM1 y CM3 quedan por debajo de ambas y bajan la envolvente; "
+                               "si una domina a la otra en a y en b, no la cambian.")
 
     st.divider()
     show_prices = st.checkbox("Mostrar líneas de precio (P1, P2, P3)", value=True)
@@ -38,102 +48,60 @@ with st.sidebar:
     show_minima = st.checkbox("Marcar mínimos de cada CM", value=True)
     highlight_envelope = st.checkbox("Resaltar envolvente (CMLP)", value=True)
 
-
-q = np.linspace(1, Qmax, int(npts))
-
-CM1 = a1 / q + b1
-CM2 = a2 / q + b2
-CM3 = a3 / q + b3
-
-CMLP = np.minimum.reduce([CM1, CM2, CM3])
-
-# Mínimos "dentro del rango" (en esta forma funcional a/q + b, el mínimo ocurre al máximo q)
-# Pero marcamos el mínimo numérico en el rango por robustez.
-def argmin_xy(x, y):
-    i = int(np.argmin(y))
-    return x[i], y[i]
-
-q1m, cm1m = argmin_xy(q, CM1)
-q2m, cm2m = argmin_xy(q, CM2)
-q3m, cm3m = argmin_xy(q, CM3)
-
-# Límites de y (robustos)
-y_min = min(CM1.min(), CM2.min(), CM3.min(), CMLP.min()) * 0.92
-y_max = max(CM1.max(), CM2.max(), CM3.max(), CMLP.max()) * 1.08
-if not np.isfinite(y_min) or not np.isfinite(y_max) or y_min == y_max:
-    y_min, y_max = 0, 1
-
-
-plt.rcParams.update({
-    "figure.dpi": 140,
-    "font.size": 11,
-    "axes.titlesize": 14,
-    "axes.labelsize": 12,
-    "axes.edgecolor": "#2b2b2b",
-    "axes.linewidth": 1.0,
-    "grid.alpha": 0.25,
-    "grid.linestyle": "-",
-    "legend.frameon": False
-})
-
-fig, ax = plt.subplots(figsize=(11, 6), constrained_layout=True)
-
-# Curvas SRAC (costo medio de corto plazo)
-ax.plot(q, CM1, linewidth=2.5, label="CM1 (técnica 1)")
-ax.plot(q, CM2, linewidth=2.5, label="CM2 (técnica 2)")
-ax.plot(q, CM3, linewidth=2.5, label="CM3 (técnica 3)")
-
-# Envolvente (CMLP)
-if highlight_envelope:
-    ax.plot(q, CMLP, linewidth=4.0, label="CMLP (envolvente)")
-    # Sombreado muy sutil para enfatizar
-    ax.fill_between(q, CMLP, y_max, alpha=0.06)
-
-# Líneas verticales TP
-if show_tps:
-    for tp, lab in [(tp1, "TP1"), (tp2, "TP2"), (tp3, "TP3")]:
-        if 0 <= tp <= Qmax:
-            ax.axvline(tp, linestyle="--", linewidth=1.4)
-            ax.text(tp, y_min + (y_max - y_min) * 0.02, lab, rotation=90,
-                    va="bottom", ha="right")
-
-# Líneas horizontales de precio (segmentos)
-if show_prices:
-    def hseg(p, tp, lab):
-        if 0 <= tp <= Qmax:
-            x0 = max(0, tp - 10)
-            x1 = min(Qmax, tp + 10)
-            ax.hlines(p, x0, x1, linewidth=3.0)
-            ax.text(tp, p, f" {lab}", va="bottom", ha="left")
-
-    hseg(p1, tp1, "P1")
-    hseg(p2, tp2, "P2")
-    hseg(p3, tp3, "P3")
-
-# Marcadores de mínimos
-if show_minima:
-    ax.scatter([q1m, q2m, q3m], [cm1m, cm2m, cm3m], s=55, zorder=5)
-    ax.annotate(f"min CM1 ≈ ({q1m:.1f}, {cm1m:.1f})", (q1m, cm1m),
-                textcoords="offset points", xytext=(10, 10), ha="left")
-    ax.annotate(f"min CM2 ≈ ({q2m:.1f}, {cm2m:.1f})", (q2m, cm2m),
-                textcoords="offset points", xytext=(10, -15), ha="left")
-    ax.annotate(f"min CM3 ≈ ({q3m:.1f}, {cm3m:.1f})", (q3m, cm3m),
-                textcoords="offset points", xytext=(10, 10), ha="left")
-
-# Ejes, título, grid
-ax.set_title("Costo Medio de Largo Plazo (CMLP) como envolvente de técnicas")
-ax.set_xlabel("Cantidad (q)")
-ax.set_ylabel("Costo medio / Precio")
-
-ax.set_xlim(0, Qmax)
-ax.set_ylim(y_min, y_max)
-ax.grid(True)
-
-# Leyenda
-ax.legend(loc="upper right")
-
-# Render
-st.pyplot(fig)
+    st.divider()
+    especular = st.checkbox("Precalcular valores vecinos (±1 paso)", value=False,
+                            help="Dibuja en segundo plano la figura del siguiente clic probable.")
+
+
+def curvas_cmlp(a1, b1, a2, b2, a3, b3, Qmax, npts, n_familia=0):
+    q = np.linspace(1, Qmax, int(npts))
+
+    # Técnicas intermedias sobre una frontera convexa en (a, b): a_t = a1^(1−t)·a3^t
+    # y b_t = b1^(1−t)·b3^t. Con a y b interpolados linealmente, CM_t sería el
+    # promedio de CM1 y CM3 y nunca bajaría la envolvente; la media geométrica
+    # queda por debajo del promedio, así que cerca del cruce CM_t < min(CM1, CM3).
+    t = np.linspace(0, 1, int(n_familia) + 2)[1:-1]
+    geometrica = lambda x1, x3: np.maximum(x1, 1e-9) ** (1 - t) * np.maximum(x3, 1e-9) ** t
+
+    # Una fila por técnica: CM_i = a_i / q + b_i
+    a_tec = np.concatenate([[a1, a2, a3], geometrica(a1, a3)])
+    b_tec = np.concatenate([[b1, b2, b3], geometrica(b1, b3)])
+    CM = a_tec[:, np.newaxis] / q + b_tec[:, np.newaxis]
+
+    CMLP = CM.min(axis=0)
+    return q, CM, CMLP
+
+
+def figura_cmlp(a1, b1, tp1, p1, a2, b2, tp2, p2, a3, b3, tp3, p3, Qmax, npts, n_familia,
+                show_prices, show_tps, show_minima, highlight_envelope):
+    q, CM, CMLP = curvas_cmlp(a1, b1, a2, b2, a3, b3, Qmax, npts, n_familia)
+    # Render en el pool de procesos (la figura se arma en modelos/figuras.py)
+    return renderizar_figura(
+        "cmlp_envolvente",
+        {"q": q, "CM": CM, "CMLP": CMLP},
+        Qmax=Qmax,
+        tps=[tp1, tp2, tp3],
+        precios=[p1, p2, p3],
+        show_prices=show_prices,
+        show_tps=show_tps,
+        show_minima=show_minima,
+        highlight_envelope=highlight_envelope,
+        n_destacadas=3,
+    )
+
+
+q, CM, CMLP = curvas_cmlp(a1, b1, a2, b2, a3, b3, Qmax, npts, n_familia)
+
+params = dict(a1=a1, b1=b1, tp1=tp1, p1=p1, a2=a2, b2=b2, tp2=tp2, p2=p2,
+              a3=a3, b3=b3, tp3=tp3, p3=p3, Qmax=Qmax, npts=npts, n_familia=n_familia,
+              show_prices=show_prices, show_tps=show_tps, show_minima=show_minima,
+              highlight_envelope=highlight_envelope)
+pasos = dict(a1=5.0, b1=0.1, tp1=1.0, p1=1.0, a2=5.0, b2=0.1, tp2=1.0, p2=1.0,
+             a3=5.0, b3=0.1, tp3=1.0, p3=1.0, Qmax=5.0, npts=50, n_familia=10)
+limites = {n: (0.0, None) for n in pasos}
+limites.update(Qmax=(2.0, None), npts=(200, 1200), n_familia=(0, 500))
+
+mostrar_png(lambda: resultado("cmlp", figura_cmlp, params, pasos, limites, activo=especular))
 
 # Panel de lectura rápida
 with st.expander("Ver resumen numérico"):
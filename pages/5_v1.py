@@ -3,6 +3,16 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
+from modelos.acelerado import find_break_even
+from modelos.escenarios import apilar, seccion_comparacion, seccion_escenarios, tabla_comparativa
+from modelos.especulacion import resultado
+from modelos.exportar import seccion_exportar
+from modelos.grafo_v1 import SALIDAS, grafo
+from modelos.perfil import perfilar_si_se_pide
+from modelos.rendimientos import EPS, tipo_rendimientos
+
+perfilar_si_se_pide(__file__)
+
 st.title("Modelo de Rendimientos (Cobb-Douglas) con Costos, Precio y Ganancias")
 
 plt.rcParams.update({
@@ -15,44 +25,6 @@ plt.rcParams.update({
     "legend.frameon": False,
 })
 
-EPS = 1e-9
-
-
-def calcular_Q(x, L, K, l, k):
-    return x * (L ** l) * (K ** k)
-
-
-def calcular_costos_y_beneficios(Q, L, w, P):
-    CT = w * L
-    Q_safe = np.maximum(Q, EPS)
-    CM = CT / Q_safe
-    IT = P * Q
-    Ganancia = IT - CT
-    return CT, CM, IT, Ganancia
-
-
-def tipo_rendimientos(l, k, tol=1e-6):
-    s = l + k
-    if s > 1 + tol:
-        return "Rendimientos crecientes (IRS)", s
-    if s < 1 - tol:
-        return "Rendimientos decrecientes (DRS)", s
-    return "Rendimientos constantes (CRS)", s
-
-
-def find_break_even(L_vals, CM_vals, P):
-    y = CM_vals - P
-    sgn = np.sign(y)
-    idx = np.where(sgn[:-1] * sgn[1:] < 0)[0]
-    roots = []
-    for i in idx:
-        x0, x1 = L_vals[i], L_vals[i + 1]
-        y0, y1 = y[i], y[i + 1]
-        xr = x0 - y0 * (x1 - x0) / (y1 - y0)
-        roots.append(float(xr))
-    return roots
-
-
 with st.sidebar:
     st.header("Parámetros")
 
@@ -71,11 +43,26 @@ with st.sidebar:
 
     show_table = st.checkbox("Mostrar tabla de resultados", value=True)
     show_break_even = st.checkbox("Marcar puntos donde CM = P (break-even)", value=True)
+    especular = st.checkbox("Precalcular valores vecinos (±1 paso)", value=False,
+                            help="Calcula en segundo plano el siguiente clic probable.")
 
 
-L_vals = np.linspace(1, float(L_max), 300)
-Q_vals = calcular_Q(x, L_vals, K, l, k)
-CT_vals, CM_vals, IT_vals, G_vals = calcular_costos_y_beneficios(Q_vals, L_vals, w, P)
+def resultados(x, K, L_max, l, k, w, P):
+    # Con parámetros escalares da curvas 1-D; con columnas (m, 1) evalúa m
+    # escenarios a la vez y cada curva queda (m, 300). Solo se recalculan las
+    # cantidades que dependen de lo que cambió (ver modelos/grafo_v1.py)
+    return grafo.evaluar(dict(x=x, K=K, L_max=L_max, l=l, k=k, w=w, P=P), SALIDAS)
+
+
+L_vals, Q_vals, CT_vals, CM_vals, IT_vals, G_vals = resultado(
+    "v1",
+    resultados,
+    dict(x=x, K=K, L_max=L_max, l=l, k=k, w=w, P=P),
+    pasos=dict(x=0.5, K=1.0, L_max=5.0, l=0.05, k=0.05, w=5.0, P=1.0),
+    limites=dict(x=(0.0001, None), K=(0.0001, None), L_max=(2.0, None),
+                 l=(0.0, None), k=(0.0, None), w=(0.0, None), P=(0.0, None)),
+    activo=especular,
+)
 
 rend_txt, sum_elast = tipo_rendimientos(l, k)
 
@@ -102,6 +89,15 @@ if show_table:
     st.subheader("Resultados numéricos")
     st.dataframe(data.round(3), use_container_width=True)
 
+seccion_exportar({
+    "L": L_vals,
+    "Q": Q_vals,
+    "CT": CT_vals,
+    "CM": CM_vals,
+    "IT": IT_vals,
+    "Ganancia": G_vals,
+}, "rendimientos_v1")
+
 roots = find_break_even(L_vals, CM_vals, P) if show_break_even else []
 
 st.subheader("Función de Producción Q(L)")
@@ -155,6 +151,25 @@ ax3.grid(True)
 st.pyplot(fig3)
 plt.close(fig3)
 
+escenarios = seccion_escenarios("v1", dict(x=x, K=K, L_max=L_max, l=l, k=k, w=w, P=P))
+if escenarios:
+    p = apilar(escenarios)
+    L_e, Q_e, CT_e, CM_e, IT_e, G_e = resultados(**p)
+    CMg_e = p["w"] / np.maximum(p["l"] * Q_e / L_e, EPS)  # CMg = w / PMg_L, con PMg_L = l·Q/L
+    break_even = [next(iter(find_break_even(L_e[i], CM_e[i], p["P"][i, 0])), np.nan)
+                  for i in range(len(escenarios))]
+    seccion_comparacion(
+        escenarios,
+        L_e,
+        {"Producción (Q)": Q_e, "Costo medio (CM)": CM_e,
+         "Costo marginal (CMg)": CMg_e, "Ganancia (IT − CT)": G_e},
+        tabla_comparativa(list(escenarios), L_e, CM_e, G_e, extras={
+            "l + k": (p["l"] + p["k"]).ravel(),
+            "Q en L = 1": Q_e[:, 0],
+            "Primer break-even (L)": break_even,
+        }),
+    )
+
 st.markdown(f"""
 ### Interpretación
 - La suma de elasticidades es **l + k = {sum_elast:.2f}**, lo que implica **{rend_txt}**.
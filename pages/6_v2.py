@@ -1,8 +1,15 @@
 import streamlit as st
 import matplotlib.pyplot as plt
-import numpy as np
 import pandas as pd
 
+from modelos.escenarios import apilar, seccion_comparacion, seccion_escenarios, tabla_comparativa
+from modelos.especulacion import resultado
+from modelos.exportar import seccion_exportar
+from modelos.grafo_v2 import SALIDAS, grafo
+from modelos.perfil import perfilar_si_se_pide
+
+perfilar_si_se_pide(__file__)
+
 st.title("Modelo de Rendimientos Crecientes, Decrecientes y Producción Exponencial")
 
 plt.rcParams.update({
@@ -14,23 +21,6 @@ plt.rcParams.update({
     "legend.frameon": False,
 })
 
-EPS = 1e-9
-
-
-def calcular_Q(x, L, K, l, k):
-    return x * (L ** l) * (K ** k)
-
-
-def calcular_costos(Q, L, w):
-    CT = w * L
-    CM = np.divide(CT, Q, out=np.zeros_like(CT, dtype=float), where=Q != 0)
-    return CT, CM
-
-
-def calcular_exponencial(x, L, K, beta):
-    return x * np.exp(beta * L) * K
-
-
 with st.sidebar.expander("Parámetros de Producción", expanded=True):
     x = st.number_input("x (Productividad total)", value=10.0, min_value=0.0001, step=0.5)
     L_max = st.number_input("L máximo (Trabajo)", value=10.0, min_value=2.0, step=1.0)
@@ -46,20 +36,30 @@ with st.sidebar.expander("Costos e ingresos", expanded=True):
     w = st.number_input("Costo por unidad de trabajo (w)", value=100.0, min_value=0.0, step=5.0)
     precio = st.number_input("Precio del producto (P)", value=50.0, min_value=0.0, step=1.0)
 
+especular = st.sidebar.checkbox("Precalcular valores vecinos (±1 paso)", value=False,
+                                help="Calcula en segundo plano el siguiente clic probable.")
 
-L_vals = np.linspace(1, float(L_max), 200)
 
-Q_decr = calcular_Q(x, L_vals, K, l_decr, k)
-Q_crec = calcular_Q(x, L_vals, K, l_crec, k)
-Q_exp = calcular_exponencial(x, L_vals, K, beta)
+def resultados(x, L_max, K, l_crec, l_decr, k, beta, w, precio):
+    # Con parámetros escalares da curvas 1-D; con columnas (m, 1) evalúa m
+    # escenarios a la vez y cada curva queda (m, 200). Solo se recalculan las
+    # cantidades que dependen de lo que cambió (ver modelos/grafo_v2.py)
+    return grafo.evaluar(dict(x=x, L_max=L_max, K=K, l_crec=l_crec, l_decr=l_decr, k=k,
+                              beta=beta, w=w, precio=precio), SALIDAS)
 
-CT_vals, CM_vals = calcular_costos(Q_crec, L_vals, w)
-IT_vals = Q_crec * precio
-G_vals = IT_vals - CT_vals
 
-PM_L = x * l_crec * (L_vals ** (l_crec - 1)) * (K ** k)
-PM_L_safe = np.maximum(PM_L, EPS)
-CMg_vals = np.divide(w, PM_L_safe, out=np.zeros_like(PM_L_safe), where=PM_L_safe != 0)
+(L_vals, Q_decr, Q_crec, Q_exp, CT_vals, CM_vals,
+ IT_vals, G_vals, PM_L, CMg_vals) = resultado(
+    "v2",
+    resultados,
+    dict(x=x, L_max=L_max, K=K, l_crec=l_crec, l_decr=l_decr, k=k, beta=beta, w=w, precio=precio),
+    pasos=dict(x=0.5, L_max=1.0, K=1.0, l_crec=0.05, l_decr=0.05, k=0.05, beta=0.01,
+               w=5.0, precio=1.0),
+    limites=dict(x=(0.0001, None), L_max=(2.0, None), K=(0.0001, None), l_crec=(0.0, None),
+                 l_decr=(0.0, None), k=(0.0, None), beta=(0.0, None), w=(0.0, None),
+                 precio=(0.0, None)),
+    activo=especular,
+)
 
 data = pd.DataFrame({
     "Trabajo (L)": L_vals,
@@ -77,6 +77,19 @@ data = pd.DataFrame({
 st.subheader("Tabla de Resultados")
 st.dataframe(data.round(3), use_container_width=True)
 
+seccion_exportar({
+    "L": L_vals,
+    "Q_crec": Q_crec,
+    "Q_decr": Q_decr,
+    "Q_exp": Q_exp,
+    "CT": CT_vals,
+    "CM": CM_vals,
+    "IT": IT_vals,
+    "Ganancia": G_vals,
+    "PM_L": PM_L,
+    "CMg": CMg_vals,
+}, "rendimientos_v2")
+
 
 st.subheader("Producción con Rendimientos Decrecientes")
 fig1, ax1 = plt.subplots(figsize=(10, 4), constrained_layout=True)
@@ -139,6 +152,24 @@ st.pyplot(fig5)
 plt.close(fig5)
 
 
+escenarios = seccion_escenarios("v2", dict(x=x, L_max=L_max, K=K, l_crec=l_crec, l_decr=l_decr,
+                                           k=k, beta=beta, w=w, precio=precio))
+if escenarios:
+    p = apilar(escenarios)
+    (L_e, Q_decr_e, Q_crec_e, Q_exp_e, CT_e, CM_e,
+     IT_e, G_e, PM_L_e, CMg_e) = resultados(**p)
+    seccion_comparacion(
+        escenarios,
+        L_e,
+        {"Producción creciente (Q)": Q_crec_e, "Costo medio (CM)": CM_e,
+         "Costo marginal (CMg)": CMg_e, "Ganancia (IT − CT)": G_e},
+        tabla_comparativa(list(escenarios), L_e, CM_e, G_e, extras={
+            "Q creciente en L máx": Q_crec_e[:, -1],
+            "Q decreciente en L máx": Q_decr_e[:, -1],
+            "Q exponencial en L máx": Q_exp_e[:, -1],
+        }),
+    )
+
 st.markdown("""
 ### Interpretación Económica
 1. **Rendimientos decrecientes:** si el exponente del trabajo es menor que 1, el producto marginal tiende a disminuir conforme aumenta L.
@@ -2,6 +2,12 @@ import streamlit as st
 import numpy as np
 import matplotlib.pyplot as plt
 
+from modelos.costos import ModeloCostos
+from modelos.figuras import familia_lineas
+from modelos.perfil import perfilar_si_se_pide
+
+perfilar_si_se_pide(__file__)
+
 def estilo_varian():
     plt.rcParams['axes.edgecolor'] = 'black'
     plt.rcParams['axes.linewidth'] = 1.2
@@ -51,33 +57,47 @@ with st.sidebar.expander("Parámetros Gráfica 2", expanded=True):
     W1 = st.number_input("Salario W1", value=12.0)
     W2 = st.number_input("Salario W2", value=8.0)
     Lmax2 = st.slider("Máximo del eje de empleo", 10, 50, 25)
+    # Familias: interceptos de b1 a b2 y salarios de W1 a W2
+    n_vpm = st.slider("Número de curvas VPM", 2, 500, 2)
+    n_w = st.slider("Número de salarios", 2, 500, 2)
+    todas_E = st.checkbox("Empleo para cada par (VPM, W)", value=False,
+                          help="Si no, se empareja VPMi con Wi como en la gráfica original.")
 
-L2 = np.linspace(0, Lmax2, 200)
-VPM1 = m * L2 + b1
-VPM2 = m * L2 + b2
+b_vals = np.linspace(b1, b2, n_vpm)
+W_vals = np.linspace(W1, W2, n_w)
 
+# Cada VPM es una recta: basta con sus extremos, forma (n_vpm, 2)
+L2 = np.array([0.0, Lmax2])
+VPM = m * L2 + b_vals[:, np.newaxis]
+
+# Empleo de equilibrio de todos los pares en una sola operación: E[i, j] = (b_i − W_j) / (−m)
 den = (-m) if abs(m) > EPS else (-EPS)  # evita división entre 0
-E1 = (b1 - W1) / den
-E2 = (b2 - W2) / den
+E = (b_vals[:, np.newaxis] - W_vals[np.newaxis, :]) / den
 
 # Recortar al rango para que siempre se vean
-E1_plot = float(np.clip(E1, 0, Lmax2))
-E2_plot = float(np.clip(E2, 0, Lmax2))
-
-fig2, ax2 = plt.subplots()
-ax2.plot(L2, VPM1, linewidth=1.4, color="black")
-ax2.plot(L2, VPM2, linewidth=1.4, color="black")
+E_plot = np.clip(E, 0, Lmax2)
+if todas_E:
+    E_lin, W_lin = E_plot.ravel(), np.broadcast_to(W_vals, E.shape).ravel()
+else:
+    k = np.arange(min(n_vpm, n_w))
+    E_lin, W_lin = E_plot[k, k], W_vals[k]
 
-ax2.axhline(W1, color="black")
-ax2.axhline(W2, color="black")
-ax2.vlines(E1_plot, 0, W1, color="black")
-ax2.vlines(E2_plot, 0, W2, color="black")
+# Con muchas curvas se adelgazan las líneas para que la familia se lea como banda
+grosor = lambda n: 1.4 if n <= 5 else max(0.3, 6.0 / n ** 0.5)
 
-# Textos: colocarlos relativo al eje para que no se pierdan
-ax2.text(0.02, W1, "W1", va="bottom", ha="left")
-ax2.text(0.02, W2, "W2", va="bottom", ha="left")
-ax2.text(E1_plot, ax2.get_ylim()[0], "E1", ha="center", va="bottom")
-ax2.text(E2_plot, ax2.get_ylim()[0], "E2", ha="center", va="bottom")
+fig2, ax2 = plt.subplots()
+# Una colección por familia en vez de un artista por curva
+familia_lineas(ax2, L2, VPM, linewidths=grosor(n_vpm), colors="black")
+ax2.hlines(W_vals, 0, 1, transform=ax2.get_yaxis_transform(), linewidths=grosor(n_w), colors="black")
+ax2.vlines(E_lin, 0, W_lin, linewidths=grosor(len(E_lin)), colors="black")
+
+# Textos: colocarlos relativo al eje para que no se pierdan (solo con pocas curvas)
+if n_w <= 5:
+    for i, W in enumerate(W_vals, start=1):
+        ax2.text(0.02, W, f"W{i}", va="bottom", ha="left")
+if len(E_lin) <= 5:
+    for i, e in enumerate(E_lin, start=1):
+        ax2.text(e, ax2.get_ylim()[0], f"E{i}", ha="center", va="bottom")
 
 ax2.set_xlabel("Empleo")
 ax2.set_ylabel("Salario")
@@ -85,7 +105,7 @@ ax2.spines["top"].set_visible(False)
 ax2.spines["right"].set_visible(False)
 
 # Límites y para que se vea todo
-ys = np.array([VPM1.min(), VPM1.max(), VPM2.min(), VPM2.max(), W1, W2], dtype=float)
+ys = np.array([VPM.min(), VPM.max(), W_vals.min(), W_vals.max()], dtype=float)
 ys = ys[np.isfinite(ys)]
 if len(ys) > 0:
     y0, y1 = ys.min(), ys.max()
@@ -98,24 +118,52 @@ if len(ys) > 0:
 st.pyplot(fig2)
 plt.close(fig2)
 
+# 3–7) MODELO DE COSTOS
+# Todas las curvas de costo salen de una sola función de costo total:
+#   CT(y) = CF + c1·y + c2·y² + c3·y³ + κ·y·max(0, y − capacidad)^p
+# y se evalúan juntas sobre la misma malla (ver modelos/costos.py).
+with st.sidebar.expander("Modelo de costos (Gráficas 3–7)", expanded=True):
+    CF = st.number_input("Costo Fijo (CF)", value=200.0)
+    base = st.number_input("CVMe mínimo (constante base)", value=8.0)
+    curvatura = st.number_input("Pendiente cuadrática del CVMe", value=0.015, step=0.005, format="%.3f")
+    y_min_cv = st.number_input("Producción donde el CVMe es mínimo", value=20.0, min_value=0.0)
+    capacidad = st.slider("Máxima Capacidad", 10, 80, 50)
+    kappa = st.number_input("Penalización por encima de la capacidad (κ)", value=0.5, min_value=0.0)
+    potencia = st.slider("Exponente", 1, 3, 2)
+    ymax = st.slider("Máximo de y", 20, 200, 60)
+
+modelo = ModeloCostos.desde_cvme(CF, base, curvatura, y_min_cv,
+                                 capacidad=capacidad, kappa=kappa, potencia=potencia)
+y = np.linspace(1, ymax, 300)
+curvas = {n: v[0] for n, v in modelo.evaluar(y).items()}
+minimos = {n: v[0] for n, v in modelo.minimos().items()}
+
+
+def ejes_varian(ax, ylabel):
+    ax.set_xlabel("y")
+    ax.set_ylabel(ylabel)
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+
+
+def ylim_robusto(ax, *series):
+    ys = np.concatenate([np.ravel(s) for s in series])
+    ys = ys[np.isfinite(ys)]
+    if len(ys) == 0:
+        return
+    y0, y1 = ys.min(), ys.max()
+    pad = 0.08 * (y1 - y0) if y1 != y0 else 1
+    ax.set_ylim(y0 - pad, y1 + pad)
+
+
 # 3) CFM
 st.header("3. Gráfica 7 – Costo Fijo Medio")
 estilo_varian()
 
-with st.sidebar.expander("Parámetros Gráfica 3", expanded=True):
-    CF = st.number_input("Costo Fijo (CF)", value=200.0)
-    ymax3 = st.slider("Máximo de y", 20, 200, 50)
-
-y3 = np.linspace(1, ymax3, 200)
-CFM = CF / y3
-
 fig3, ax3 = plt.subplots()
-ax3.plot(y3, CFM, color="black")
-ax3.text(y3[-1], CFM[-1], "CFM", ha="left", va="center")
-ax3.set_xlabel("y")
-ax3.set_ylabel("CFM")
-ax3.spines["top"].set_visible(False)
-ax3.spines["right"].set_visible(False)
+ax3.plot(y, curvas["CFM"], color="black")
+ax3.text(y[-1], curvas["CFM"][-1], "CFM", ha="left", va="center")
+ejes_varian(ax3, "CFM")
 
 st.pyplot(fig3)
 plt.close(fig3)
@@ -124,34 +172,12 @@ plt.close(fig3)
 st.header("4. Gráfica 8 – CVM con Máxima Capacidad")
 estilo_varian()
 
-with st.sidebar.expander("Parámetros Gráfica 4", expanded=True):
-    costo_base = st.number_input("Costo base", value=20.0)
-    capacidad = st.slider("Máxima Capacidad", 10, 80, 40)
-    potencia = st.slider("Exponente", 1, 3, 2)
-
-y4 = np.linspace(1, 60, 300)
-CVM = np.piecewise(
-    y4,
-    [y4 < capacidad, y4 >= capacidad],
-    [
-        lambda y: costo_base * np.ones_like(y),
-        lambda y: costo_base + 0.5 * (y - capacidad) ** potencia
-    ]
-)
-
 fig4, ax4 = plt.subplots()
-ax4.plot(y4, CVM, color="black")
+ax4.plot(y, curvas["CVMe"], color="black")
 ax4.axvline(capacidad, color="black")
-ax4.text(capacidad + 1, costo_base, "Máxima\ncapacidad", ha="left", va="top")
-ax4.set_xlabel("y")
-ax4.set_ylabel("CVM")
-ax4.spines["top"].set_visible(False)
-ax4.spines["right"].set_visible(False)
-
-# y-limits robustos
-ymin, ymax = np.nanmin(CVM), np.nanmax(CVM)
-if np.isfinite(ymin) and np.isfinite(ymax) and ymin != ymax:
-    ax4.set_ylim(ymin - 0.08 * (ymax - ymin), ymax + 0.10 * (ymax - ymin))
+ax4.text(capacidad + 1, curvas["CVMe"].min(), "Máxima\ncapacidad", ha="left", va="bottom")
+ejes_varian(ax4, "CVM")
+ylim_robusto(ax4, curvas["CVMe"])
 
 st.pyplot(fig4)
 plt.close(fig4)
@@ -160,20 +186,14 @@ plt.close(fig4)
 st.header("5. Gráfica 9 – CVMe")
 estilo_varian()
 
-with st.sidebar.expander("Parámetros Gráfica 5", expanded=True):
-    a = st.number_input("Constante base", value=8.0)
-    c = st.number_input("Pendiente cuadrática", value=0.015)
-
-y5 = np.linspace(1, 60, 300)
-CVMe = a + c * (y5 - 20) ** 2
-
 fig5, ax5 = plt.subplots()
-ax5.plot(y5, CVMe, color="black")
-ax5.text(y5[-1], CVMe[-1], "CVMe", ha="left", va="center")
-ax5.set_xlabel("y")
-ax5.set_ylabel("CMe")
-ax5.spines["top"].set_visible(False)
-ax5.spines["right"].set_visible(False)
+ax5.plot(y, curvas["CVMe"], color="black")
+ax5.text(y[-1], curvas["CVMe"][-1], "CVMe", ha="left", va="center")
+if np.isfinite(minimos["CVMe"]) and minimos["CVMe"] <= ymax:
+    y_cv = minimos["CVMe"]
+    ax5.vlines(y_cv, 0, np.interp(y_cv, y, curvas["CVMe"]), color="black", linestyle=":")
+ejes_varian(ax5, "CMe")
+ylim_robusto(ax5, curvas["CVMe"])
 
 st.pyplot(fig5)
 plt.close(fig5)
@@ -182,58 +202,45 @@ plt.close(fig5)
 st.header("6. Gráfica 10 – CMe (Curva en U)")
 estilo_varian()
 
-with st.sidebar.expander("Parámetros Gráfica 6", expanded=True):
-    c0 = st.number_input("Nivel base", value=10.0)
-    c2 = st.number_input("Coeficiente cuadrático", value=0.02)
-
-y6 = np.linspace(1, 60, 300)
-CMe = c0 + c2 * (y6 - 30) ** 2
-
 fig6, ax6 = plt.subplots()
-ax6.plot(y6, CMe, color="black")
-ax6.text(y6[-1], CMe[-1], "CMe", ha="left", va="center")
-ax6.set_xlabel("y")
-ax6.set_ylabel("CMe")
-ax6.spines["top"].set_visible(False)
-ax6.spines["right"].set_visible(False)
+ax6.plot(y, curvas["CMe"], color="black")
+ax6.text(y[-1], curvas["CMe"][-1], "CMe", ha="left", va="center")
+ejes_varian(ax6, "CMe")
+ylim_robusto(ax6, curvas["CMe"])
 
 st.pyplot(fig6)
 plt.close(fig6)
 
-# 7) CM + CVMe (Gráfica 11)
-st.header("7. Gráfica 11 – CM y CVMe")
+# 7) CMg + CMe + CVMe (Gráfica 11)
+st.header("7. Gráfica 11 – CMg, CMe y CVMe")
 estilo_varian()
 
-with st.sidebar.expander("Parámetros Gráfica 7", expanded=True):
-    cCM = st.number_input("CM — parámetro cuadrático", value=0.015)
-    cCV = st.number_input("CVMe — parámetro cuadrático", value=0.008)
-    shift_CM = st.number_input("Desplazamiento CM", value=28.0)
-    shift_CV = st.number_input("Desplazamiento CVMe", value=38.0)
-
-y7 = np.linspace(1, 60, 300)
-CM = cCM * (y7 - shift_CM) ** 2 + 8
-CVMe2 = cCV * (y7 - shift_CV) ** 2 + 9
-
 fig7, ax7 = plt.subplots()
-ax7.plot(y7, CM, color="black")
-ax7.plot(y7, CVMe2, color="black")
-
-# Etiquetas colocadas dentro del rango de forma robusta
-i_cm = int(np.argmin(CM))
-i_cv = int(np.argmin(CVMe2))
-ax7.text(y7[i_cm], CM[i_cm], "CM", ha="left", va="bottom")
-ax7.text(y7[i_cv], CVMe2[i_cv], "CVMe", ha="left", va="bottom")
-
-ax7.set_xlabel("y")
-ax7.set_ylabel("Costos")
-ax7.spines["top"].set_visible(False)
-ax7.spines["right"].set_visible(False)
-
-ys = np.array([CM.min(), CM.max(), CVMe2.min(), CVMe2.max()], dtype=float)
-y0, y1 = ys.min(), ys.max()
-pad = 0.08 * (y1 - y0) if y1 != y0 else 1
-ax7.set_ylim(y0 - pad, y1 + pad)
+for nombre, estilo in [("CMg", "-"), ("CMe", "-"), ("CVMe", "--")]:
+    ax7.plot(y, curvas[nombre], color="black", linestyle=estilo)
+
+# El CMg corta a CVMe y a CMe justo en sus mínimos (ubicación exacta)
+for nombre in ("CVMe", "CMe"):
+    y_c = minimos[nombre]
+    if np.isfinite(y_c) and y_c <= ymax:
+        c = np.interp(y_c, y, curvas[nombre])
+        ax7.scatter([y_c], [c], color="black", s=25, zorder=5)
+        ax7.text(y_c, c, f" {nombre}", ha="left", va="top")
+i_cmg = int(np.argmin(curvas["CMg"]))
+ax7.text(y[i_cmg], curvas["CMg"][i_cmg], "CMg ", ha="right", va="top")
+
+ejes_varian(ax7, "Costos")
+# CF/y cerca de 0 y la penalización de capacidad aplastarían los cruces:
+# se muestra hasta 2.5 veces el CMe mínimo
+cme_min = np.nanmin(curvas["CMe"])
+if np.isfinite(cme_min) and cme_min > 0:
+    ax7.set_ylim(0, 2.5 * cme_min)
 
 st.pyplot(fig7)
 plt.close(fig7)
 
+with st.expander("Ver resumen del modelo de costos"):
+    c1_, c2_, c3_ = st.columns(3)
+    c1_.metric("Mínimo del CMg en y", f"{minimos['CMg']:.2f}")
+    c2_.metric("Mínimo del CVMe (CMg = CVMe) en y", f"{minimos['CVMe']:.2f}")
+    c3_.metric("Mínimo del CMe (CMg = CMe) en y", f"{minimos['CMe']:.2f}")
@@ -0,0 +1,103 @@
+import streamlit as st
+import numpy as np
+import pandas as pd
+
+from modelos.estimacion import MCOIncremental
+from modelos.modelo_cobb import actualizar
+from modelos.perfil import perfilar_si_se_pide
+from modelos.rendimientos import tipo_rendimientos
+
+perfilar_si_se_pide(__file__)
+
+st.title("Estimación Cobb-Douglas a partir de datos")
+
+st.caption(
+    "Modelo: log Q = log A + a·log K + b·log L. "
+    "El archivo se lee por bloques y solo se acumulan X'X, X'y e y'y, "
+    "así que la memoria no depende del número de filas."
+)
+
+
+def columna_por_nombre(columnas, nombre):
+    for i, c in enumerate(columnas):
+        if str(c).strip().lower() == nombre.lower():
+            return i
+    return 0
+
+
+archivo = st.file_uploader("Archivo CSV con columnas de capital, trabajo y producción", type=["csv"])
+
+if archivo is None:
+    st.info("Sube un CSV con una fila por planta u observación (por ejemplo columnas K, L, Q).")
+    st.stop()
+
+columnas = list(pd.read_csv(archivo, nrows=0).columns)
+archivo.seek(0)
+
+if len(columnas) < 3:
+    st.error("El archivo debe tener al menos tres columnas.")
+    st.stop()
+
+with st.sidebar:
+    st.header("Columnas")
+    col_K = st.selectbox("Capital (K)", columnas, index=columna_por_nombre(columnas, "K"))
+    col_L = st.selectbox("Trabajo (L)", columnas, index=columna_por_nombre(columnas, "L"))
+    col_Q = st.selectbox("Producción (Q)", columnas, index=columna_por_nombre(columnas, "Q"))
+    filas_bloque = st.number_input("Filas por bloque", value=200_000, min_value=1_000, step=50_000)
+
+if st.button("Estimar"):
+    mco = MCOIncremental()
+    avance = st.progress(0.0, text="Leyendo datos…")
+
+    bloques = pd.read_csv(archivo, usecols=[col_K, col_L, col_Q], chunksize=int(filas_bloque))
+    for bloque in bloques:
+        # Valores no numéricos quedan como NaN y se descartan al filtrar > 0
+        datos = bloque.apply(pd.to_numeric, errors="coerce")
+        mco.agregar(datos[col_K].to_numpy(), datos[col_L].to_numpy(), datos[col_Q].to_numpy())
+        avance.progress(min(archivo.tell() / max(archivo.size, 1), 1.0),
+                        text=f"{mco.n:,} filas válidas")
+    archivo.seek(0)
+    avance.empty()
+
+    try:
+        st.session_state["estimacion_cobb"] = mco.ajustar()
+    except (ValueError, np.linalg.LinAlgError) as e:
+        st.session_state.pop("estimacion_cobb", None)
+        st.error(f"No se pudo estimar el modelo: {e}")
+
+res = st.session_state.get("estimacion_cobb")
+if res is None:
+    st.stop()
+
+rend_txt, suma = tipo_rendimientos(res["b"], res["a"])
+
+st.subheader("Resultados")
+c1, c2, c3, c4 = st.columns(4)
+c1.metric("Eficiencia (A)", f"{res['A']:.4f}")
+c2.metric("Elasticidad del capital (a)", f"{res['a']:.4f}", f"± {res['ee_a']:.4f}", delta_color="off")
+c3.metric("Elasticidad del trabajo (b)", f"{res['b']:.4f}", f"± {res['ee_b']:.4f}", delta_color="off")
+c4.metric("R²", f"{res['r2']:.4f}")
+
+tabla = pd.DataFrame({
+    "Coeficiente": ["log A", "a (capital)", "b (trabajo)", "a + b"],
+    "Estimación": [np.log(res["A"]), res["a"], res["b"], suma],
+    "Error estándar": [res["ee_logA"], res["ee_a"], res["ee_b"], res["ee_suma"]],
+})
+tabla["t"] = tabla["Estimación"] / tabla["Error estándar"]
+st.dataframe(tabla.round(4), hide_index=True, width="stretch")
+
+# Contraste de rendimientos constantes: H0: a + b = 1
+t_crs = (suma - 1) / res["ee_suma"] if res["ee_suma"] > 0 else float("nan")
+
+st.markdown(f"""
+### Rendimientos a escala
+- **a + b = {suma:.4f}** (error estándar {res['ee_suma']:.4f}), lo que implica **{rend_txt}**.
+- Estadístico t para H₀: a + b = 1 → **{t_crs:.2f}** (|t| > 1.96 rechaza rendimientos constantes al 5%).
+- Observaciones usadas: **{res['n']:,}**; descartadas (no positivas o no numéricas): **{res['descartadas']:,}**.
+""")
+
+if res["a"] < 0 or res["b"] < 0:
+    st.warning("Alguna elasticidad estimada es negativa; las páginas de gráficas solo aceptan valores ≥ 0.")
+elif st.button("Usar estos parámetros en las gráficas Cobb-Douglas"):
+    actualizar(estimado=True, A=res["A"], a=res["a"], b=res["b"])
+    st.success("Listo: las páginas de Funciones, Gráficas e Isocuantas usarán A, a y b estimados.")
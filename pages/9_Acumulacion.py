@@ -0,0 +1,181 @@
+import time
+
+import streamlit as st
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from modelos.acumulacion import (CUANTILES, MAX_BLOQUE_MB, Trayectorias, estado_estacionario,
+                                 periodos_por_bloque, simular, velocidad_convergencia)
+from modelos.exportar import seccion_exportar
+from modelos.figuras import familia_lineas
+from modelos.modelo_cobb import entrada
+from modelos.perfil import perfilar_si_se_pide
+
+perfilar_si_se_pide(__file__)
+
+st.title("Acumulación de Capital – Cobb-Douglas con choques de productividad")
+
+plt.rcParams.update({
+    "figure.dpi": 140,
+    "font.size": 11,
+    "axes.titlesize": 14,
+    "axes.labelsize": 12,
+    "grid.alpha": 0.25,
+    "legend.frameon": False,
+})
+
+# Se simula sola al cambiar un parámetro si caminos × periodos no pasa de esto;
+# arriba de eso espera al botón
+MAX_AUTOMATICO = 5_000_000
+# La gráfica en vivo se redibuja a lo más cada REFRESCO segundos, con a lo más
+# PUNTOS_VIVO periodos (submuestreados) para no reenviar toda la historia
+REFRESCO = 0.5
+PUNTOS_VIVO = 400
+
+with st.sidebar:
+    st.header("Parámetros")
+
+    # Valores compartidos con Funciones, Gráficas e Isocuantas (ver modelos/modelo_cobb.py)
+    with st.expander("Función de Producción", expanded=True):
+        A = entrada("A", "Eficiencia total (A)", "acumulacion")
+        a = entrada("a", "Elasticidad del Capital (a)", "acumulacion")
+        b = entrada("b", "Elasticidad del Trabajo (b)", "acumulacion")
+        L = entrada("L", "Trabajo (L)", "acumulacion", min_value=0.1)
+        K0 = entrada("K", "Capital inicial (K₀)", "acumulacion", min_value=0.1)
+
+    with st.expander("Dinámica", expanded=True):
+        s = st.number_input("Tasa de ahorro (s)", value=0.2, min_value=0.0, max_value=1.0, step=0.01)
+        delta = st.number_input("Depreciación (δ)", value=0.1, min_value=0.001, max_value=1.0, step=0.01)
+        rho = st.number_input("Persistencia del choque (ρ)", value=0.9, min_value=0.0, max_value=0.999, step=0.01)
+        sigma = st.number_input("Desviación del choque (σ)", value=0.05, min_value=0.0, step=0.01)
+
+    with st.expander("Simulación", expanded=True):
+        n_caminos = st.number_input("Caminos", value=2000, min_value=1, max_value=200_000, step=1000)
+        periodos = st.number_input("Periodos", value=300, min_value=10, max_value=20_000, step=50)
+        semilla = st.number_input("Semilla", value=0, min_value=0, step=1)
+        tolerancia = st.number_input("Tolerancia alrededor de K* (%)", value=5.0, min_value=0.1, step=0.5) / 100
+
+
+st.latex(r"K_{t+1} = s\,A\,e^{z_t}K_t^{a}L^{b} + (1-\delta)K_t,\qquad z_{t+1} = \rho z_t + \sigma\varepsilon_{t+1}")
+
+K_est = estado_estacionario(A, a, b, L, s, delta)
+tasa, vida_teorica = velocidad_convergencia(a, delta)
+
+c1, c2, c3 = st.columns(3)
+c1.metric("Estado estacionario sin choques (K*)", f"{K_est:.3f}" if np.isfinite(K_est) else "no existe")
+c2.metric("Velocidad de convergencia (1 − a)·δ", f"{tasa:.4f}")
+c3.metric("Vida media teórica", f"{vida_teorica:.1f} periodos" if np.isfinite(vida_teorica) else "—")
+if not np.isfinite(K_est):
+    st.warning("Con a ≥ 1 (o sin ahorro) el capital no converge a un estado estacionario.")
+
+
+def correr(params):
+    # Simula por bloques mostrando el avance; regresa las Trayectorias o None
+    # si la simulación es grande y todavía no se pidió
+    n, T = params["n_caminos"], params["periodos"]
+    filas = periodos_por_bloque(n)
+    st.caption(f"{n:,} caminos × {T + 1:,} periodos, en bloques de {min(filas, T + 1):,} periodos "
+               f"(≤ {MAX_BLOQUE_MB:.0f} MB por bloque; la matriz completa serían "
+               f"{n * (T + 1) * 8 / 2**20:,.0f} MB).")
+    if n * (T + 1) > MAX_AUTOMATICO and not st.button("Simular"):
+        return None
+
+    trayectorias = Trayectorias(T)
+    avance = st.progress(0.0, text="Simulando…")
+    vivo = st.empty()
+    ultimo = 0.0
+    for bloque in simular(**params):
+        trayectorias.agregar(bloque)
+        if time.monotonic() - ultimo < REFRESCO:
+            continue
+        ultimo = time.monotonic()
+        hecho = (bloque["t"][-1] + 1) / (T + 1)
+        avance.progress(hecho, text=f"Periodo {bloque['t'][-1]:,} de {T:,}")
+        filas = np.unique(np.linspace(0, trayectorias.n - 1, PUNTOS_VIVO).astype(int))
+        q = trayectorias["cuantiles"][:, filas]
+        vivo.line_chart(pd.DataFrame({"Percentil 5": q[0], "Mediana": q[2], "Percentil 95": q[-1]},
+                                     index=trayectorias["t"][filas]))
+    avance.empty()
+    vivo.empty()
+    return trayectorias
+
+
+params = dict(A=A, a=a, b=b, L=L, K0=K0, s=s, delta=delta, rho=rho, sigma=sigma,
+              n_caminos=int(n_caminos), periodos=int(periodos), semilla=int(semilla), tolerancia=tolerancia)
+guardado = st.session_state.get("acumulacion")
+if guardado is None or guardado[0] != params:
+    trayectorias = correr(params)
+    guardado = (params, trayectorias) if trayectorias is not None else None
+    if guardado is not None:
+        st.session_state["acumulacion"] = guardado
+
+if guardado is not None:
+    tr = guardado[1]
+    t, q, media = tr["t"], tr["cuantiles"], tr["media"]
+    res = tr.resumen(K0, K_est, tolerancia)
+
+    st.subheader("Resultados")
+    d1, d2, d3, d4 = st.columns(4)
+    d1.metric("K de largo plazo (media, último 20 %)", f"{res['K_largo_plazo']:.3f}",
+              f"{res['K_largo_plazo'] - K_est:+.3f} vs K*" if np.isfinite(K_est) else None, delta_color="off")
+    d2.metric("Dispersión de largo plazo (desv.)", f"{res['desv_largo_plazo']:.3f}")
+    d3.metric("Vida media observada", f"{res['vida_media']} periodos" if res["vida_media"] is not None else "—")
+    d4.metric(f"Caminos a ±{tolerancia:.0%} de K* al final", f"{res['cerca_final']:.0%}")
+    if res["llegada_mediana"] is not None:
+        st.caption(f"La mediana entra a ±{tolerancia:.0%} de K* en el periodo {res['llegada_mediana']:,}.")
+
+    st.subheader("Distribución del capital en el tiempo")
+    fig1, ax1 = plt.subplots(figsize=(10, 4.5), constrained_layout=True)
+    familia_lineas(ax1, t, tr["muestra"], colors="0.6", linewidths=0.6, alpha=0.5)
+    ax1.fill_between(t, q[0], q[-1], alpha=0.18, label=f"Percentiles {CUANTILES[0]:.0%}–{CUANTILES[-1]:.0%}")
+    ax1.fill_between(t, q[1], q[-2], alpha=0.3, label=f"Percentiles {CUANTILES[1]:.0%}–{CUANTILES[-2]:.0%}")
+    ax1.plot(t, q[2], linewidth=2.4, label="Mediana")
+    ax1.plot(t, media, linestyle="--", linewidth=1.6, label="Media")
+    if np.isfinite(K_est):
+        ax1.axhline(K_est, color="black", linestyle=":", linewidth=1.6, label="K* sin choques")
+    ax1.set_xlabel("Periodo (t)")
+    ax1.set_ylabel("Capital (K)")
+    ax1.grid(True)
+    ax1.legend(loc="lower right")
+    st.pyplot(fig1)
+    plt.close(fig1)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        fig2, ax2 = plt.subplots(figsize=(6, 4), constrained_layout=True)
+        ax2.hist(tr.K_final, bins=60, alpha=0.8)
+        if np.isfinite(K_est):
+            ax2.axvline(K_est, color="black", linestyle=":", linewidth=1.6, label="K*")
+            ax2.legend()
+        ax2.set_title(f"Capital en t = {t[-1]:,}")
+        ax2.set_xlabel("Capital (K)")
+        ax2.set_ylabel("Caminos")
+        ax2.grid(True)
+        st.pyplot(fig2)
+        plt.close(fig2)
+    with col2:
+        fig3, ax3 = plt.subplots(figsize=(6, 4), constrained_layout=True)
+        ax3.plot(t, tr["cerca"], linewidth=2.2)
+        ax3.set_ylim(0, 1.02)
+        ax3.set_title(f"Caminos a ±{tolerancia:.0%} de K*")
+        ax3.set_xlabel("Periodo (t)")
+        ax3.set_ylabel("Fracción")
+        ax3.grid(True)
+        st.pyplot(fig3)
+        plt.close(fig3)
+
+    columnas = {"t": t, "media": media, "desv": tr["desv"], "cerca": tr["cerca"]}
+    columnas.update({f"p{int(c * 100):02d}": q[i] for i, c in enumerate(CUANTILES)})
+    with st.expander("Ver cuantiles por periodo"):
+        filas = np.unique(np.linspace(0, len(t) - 1, 21).astype(int))
+        st.dataframe(pd.DataFrame({n: v[filas] for n, v in columnas.items()}).set_index("t").round(3),
+                     width="stretch")
+    seccion_exportar(columnas, "acumulacion")
+
+st.markdown("""
+### Interpretación
+- Sin choques, el capital converge a **K\\*** = (s·A·L^b / δ)^{1/(1−a)}: ahí el ahorro s·Q repone justo la depreciación δ·K.
+- Cerca de K\\*, la brecha se reduce una fracción **(1 − a)·δ** por periodo: con más peso del capital (a cerca de 1) la convergencia es más lenta.
+- Con choques de productividad, los caminos no se quedan en K\\* sino que fluctúan alrededor de él; los percentiles muestran esa distribución de largo plazo.
+""")